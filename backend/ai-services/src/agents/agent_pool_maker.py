@@ -263,6 +263,7 @@ class AgentPoolMaker(BaseAgent):
         agent_spec = AgentSpecification(
             name=template.name,
             type=template.type,
+            base_class=template.base_class,
             technologies=template.technologies.copy(),
             responsibilities=template.responsibilities.copy(),
             tools=template.tools.copy()
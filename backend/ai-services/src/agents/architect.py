@@ -4,6 +4,8 @@ Meta-agent that creates system prompts for other agents
 """
 
 from typing import Any, Dict, Optional
+import asyncio
+import hashlib
 import json
 import logging
 
@@ -89,6 +91,10 @@ Every agent you create must be reliable, predictable, and secure."""
             system_prompt=system_prompt,
             model=model
         )
+        
+        # Specifications currently being generated, keyed by input hash.
+        # Concurrent identical requests share one LLM round-trip.
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     async def execute(self, input_data: Dict[str, Any], context: AgentContext) -> AgentResult:
         """
@@ -165,6 +171,22 @@ Every agent you create must be reliable, predictable, and secure."""
             # Return a template if no model is available
             return self.generate_template_specification(input_data)
         
+        key = hashlib.sha256(
+            json.dumps(input_data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        
+        task = self._inflight.get(key)
+        if task is None:
+            # The request runs in its own task, owned by no single caller
+            task = asyncio.create_task(self._request_agent_specification(input_data))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so a cancelled caller does not cancel the call the others share
+        return await asyncio.shield(task)
+    
+    async def _request_agent_specification(self, input_data: Dict[str, Any]) -> str:
+        """Request a single agent specification from the LLM"""
         prompt = f"""
 Based on the following requirements, create a complete agent specification:
 
@@ -192,6 +214,8 @@ Ensure the agent is secure, reliable, and follows best practices.
         agent_type = input_data.get('agent_type', 'general')
         capabilities = input_data.get('capabilities', ['Process user input', 'Generate responses'])
         constraints = input_data.get('constraints', ['Maintain security', 'Validate input'])
+        capabilities_block = '\n'.join([f'- {cap}' for cap in capabilities])
+        constraints_block = '\n'.join([f'- {con}' for con in constraints])
         
         return f"""AGENT_NAME: {agent_name}
 VERSION: 1.0.0
@@ -200,10 +224,10 @@ ROLE:
 You are {agent_name}, a specialized {agent_type} agent. {agent_purpose}
 
 CAPABILITIES:
-{chr(10).join(f'- {cap}' for cap in capabilities)}
+{capabilities_block}
 
 LIMITATIONS:
-{chr(10).join(f'- {con}' for con in constraints)}
+{constraints_block}
 - Cannot access external systems without proper authorization
 - Must validate all input before processing
 - Cannot store sensitive data without encryption
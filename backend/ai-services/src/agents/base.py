@@ -77,6 +77,10 @@ class Tool(ABC):
 class BaseAgent(ABC):
     """Base class for all agents"""
     
+    # Set by the agent factory from the specification an agent was created for
+    agent_id: Optional[str] = None
+    custom_config: Optional[Dict[str, Any]] = None
+    
     def __init__(
         self,
         name: str,
@@ -230,6 +234,10 @@ Respond in the following JSON format:
     def get_recent_history(self, n: int = 10) -> List[AgentResult]:
         """Get n most recent execution results"""
         return self.execution_history[-n:] if self.execution_history else []
+    
+    def cleanup(self):
+        """Release resources held outside the agent, such as worker processes"""
+        pass  # Override in subclasses
 
 
 class ConversationalAgent(BaseAgent):
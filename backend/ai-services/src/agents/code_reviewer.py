@@ -8,15 +8,29 @@ import logging
 import ast
 import re
 import math
-from typing import Dict, List, Optional, Any, Tuple, Set
-from dataclasses import dataclass, field
+import hashlib
+import sqlite3
+import multiprocessing
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import asyncio
-from datetime import datetime
-from collections import defaultdict
+import bisect
+import fnmatch
+import functools
+import itertools
+from collections import Counter, OrderedDict
 
-from .base import BaseAgent, AgentContext, AgentStatus, AgentType
+try:
+    # RE2 matches in linear time, so pathological lines cannot stall a review
+    import re2 as _secret_re
+except ImportError:
+    _secret_re = re
+
+from .base import BaseAgent, AgentContext, AgentType
 from .execution_limiter import ExecutionLimiter
 from ..config import Config
 
@@ -45,7 +59,7 @@ class IssueCategory(Enum):
     DUPLICATION = "duplication"
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeIssue:
     """Represents a code issue found during review"""
     file: str
@@ -59,7 +73,7 @@ class CodeIssue:
     rule: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeMetrics:
     """Code quality metrics"""
     lines_of_code: int = 0
@@ -91,117 +105,445 @@ class ReviewResult:
     passed: bool
 
 
+# Files larger than this (in bytes) are streamed in blocks of lines and skip
+# the analyses that need the whole file (Python AST, JavaScript complexity)
+_LARGE_FILE_SIZE = 1024 * 1024
+_STREAM_BLOCK_LINES = 10000
+
+# Bytes read from the start of a file to tell whether it is binary
+_BINARY_SNIFF_SIZE = 4096
+
+# Persistent review caches, one per project under the user's cache directory.
+# Bump the version whenever the review of an unchanged file may produce new results.
+_REVIEW_CACHE_DIR = Path('devex', 'reviews')
+_REVIEW_CACHE_VERSION = 2
+
+# Directories skipped when reviewing a project (dependencies, caches, build output)
+_SKIP_DIRS = frozenset(['node_modules', '__pycache__', '.git', 'dist', 'build'])
+
+# How review worker processes are started. Forking this multi-threaded
+# service directly is unsafe, and a fork-based pool starts every worker up
+# front; with these, workers are started only as files need them.
+_WORKER_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Files whose content is kept for reuse between reads, most recent first out
+_SOURCE_CACHE_SIZE = 256
+
+# Review score deductions, per issue and for each metric past a threshold.
+# Thresholds are checked in order and the first one crossed applies.
+_SEVERITY_PENALTIES = {
+    SeverityLevel.CRITICAL: 20,
+    SeverityLevel.HIGH: 10,
+    SeverityLevel.MEDIUM: 5,
+    SeverityLevel.LOW: 2,
+    SeverityLevel.INFO: 0
+}
+_CYCLOMATIC_PENALTIES = ((30, 15), (20, 10), (10, 5))      # Above threshold
+_COGNITIVE_PENALTIES = ((40, 15), (25, 10), (15, 5))       # Above threshold
+_MAINTAINABILITY_PENALTIES = ((30, 15), (50, 10), (70, 5))  # Below threshold
+_NESTING_PENALTIES = ((6, 10), (4, 5))                     # Above threshold
+
+# Issue severities counted as code smells in project metrics
+_CODE_SMELL_SEVERITIES = (SeverityLevel.MEDIUM, SeverityLevel.LOW)
+
+# Hard-coded credentials, checked on every line of every file. One
+# alternation rules out lines leaking nothing; the patterns of each kind then
+# tell which leaks a line has, as they may overlap. The case-insensitive flag
+# is inline because RE2 takes no flags argument.
+_SENSITIVE_KINDS = (
+    ("API key exposed", r'(?:api[_-]?key|apikey)\s*=\s*["\'][\w\-]+["\']'),
+    ("Password/secret exposed", r'(?:secret|password|passwd|pwd)\s*=\s*["\'][^"\']+["\']'),
+    ("Token exposed", r'token\s*=\s*["\'][\w\-\.]+["\']'),
+    ("Private key exposed", r'private[_-]?key\s*=\s*["\'][^"\']+["\']'),
+)
+_SENSITIVE_PATTERN = _secret_re.compile(
+    '(?i)' + '|'.join(f'(?:{pattern})' for _, pattern in _SENSITIVE_KINDS)
+)
+_SENSITIVE_KIND_PATTERNS = tuple(
+    (_secret_re.compile('(?i)' + pattern), message) for message, pattern in _SENSITIVE_KINDS
+)
+
+_TODO_PATTERN = re.compile(r'\b(TODO|FIXME|HACK|XXX)\b', re.IGNORECASE)
+
+# JavaScript-specific patterns: (pattern, message, severity, category, suggestion)
+_JS_PATTERNS = (
+    (re.compile(r'==(?!=)'), "Use === for strict equality", SeverityLevel.MEDIUM,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'!=(?!=)'), "Use !== for strict inequality", SeverityLevel.MEDIUM,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'\bvar\s+'), "Use 'const' or 'let' instead of 'var'", SeverityLevel.LOW,
+     IssueCategory.STYLE, None),
+    (re.compile(r'console\.(log|debug|info)'), "Remove console statements", SeverityLevel.LOW,
+     IssueCategory.STYLE, None),
+    (re.compile(r'debugger;'), "Remove debugger statement", SeverityLevel.HIGH,
+     IssueCategory.RELIABILITY, None),
+)
+
+# JavaScript function declarations and function-valued bindings
+_JS_FUNCTION_PATTERN = re.compile(
+    r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>))'
+)
+
+# Tokens that matter when matching a JavaScript function's brackets. String
+# and template literals and comments are consumed whole (so every token
+# longer than one character is one of them), and brackets inside them are
+# skipped; unterminated quotes match nothing and are ignored.
+_JS_BRACKET_TOKEN_PATTERN = re.compile(
+    r'"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r'|`(?:\\.|[^`\\])*`'
+    r'|//[^\n]*'
+    r'|/\*.*?\*/'
+    r'|[{}()]',
+    re.DOTALL
+)
+
+# Decision points for the JavaScript complexity heuristic. Keywords and
+# logical operators never overlap, so one alternation counts them all in a
+# single scan; 'else if' matches only 'else' so its 'if' is still counted.
+# The ternary pattern consumes text and is counted separately.
+_JS_DECISION_PATTERN = re.compile(
+    r'\b(?:if|else(?=\s+if\b)|while|for|do|switch|case|catch)\b|&&|\|\|'
+)
+_JS_TERNARY_PATTERN = re.compile(r'\?\s*[^:]+\s*:')
+
+# TypeScript-specific patterns, applied on top of the JavaScript ones
+_TS_PATTERNS = tuple(
+    (re.compile(pattern), message, severity, IssueCategory.MAINTAINABILITY, "Use proper typing instead")
+    for pattern, message, severity in (
+        (r'\bany\b(?!\s*\])', "Avoid using 'any' type", SeverityLevel.MEDIUM),
+        (r'@ts-ignore', "Avoid using @ts-ignore", SeverityLevel.MEDIUM),
+        (r'@ts-nocheck', "Avoid using @ts-nocheck", SeverityLevel.HIGH),
+    )
+)
+
+# Vue single-file component sections
+_VUE_SCRIPT_PATTERN = re.compile(r'<script[^>]*>(.*?)</script>', re.DOTALL)
+_VUE_TEMPLATE_PATTERN = re.compile(r'<template>')
+
+# Line patterns for the other languages: (pattern, message, severity, category, suggestion)
+_GO_PATTERNS = (
+    (re.compile(r'panic\('), "Avoid using panic in production code", SeverityLevel.HIGH,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'fmt\.Print'), "Use proper logging instead of fmt.Print", SeverityLevel.LOW,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'if\s+err\s*!=\s*nil\s*{\s*}'), "Empty error handling", SeverityLevel.HIGH,
+     IssueCategory.RELIABILITY, None),
+)
+
+_RUST_PATTERNS = (
+    (re.compile(r'unwrap\(\)'), "Avoid using unwrap() - handle errors properly", SeverityLevel.MEDIUM,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'expect\('), "Consider proper error handling instead of expect()", SeverityLevel.LOW,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'unsafe\s*{'), "Unsafe code block detected", SeverityLevel.HIGH,
+     IssueCategory.SECURITY, None),
+)
+
+_JAVA_PATTERNS = (
+    (re.compile(r'System\.out\.print'), "Use proper logging instead of System.out", SeverityLevel.LOW,
+     IssueCategory.MAINTAINABILITY, None),
+    (re.compile(r'catch\s*\(\s*Exception\s+\w+\s*\)'), "Avoid catching generic Exception", SeverityLevel.MEDIUM,
+     IssueCategory.MAINTAINABILITY, None),
+    (re.compile(r'@SuppressWarnings'), "Avoid suppressing warnings", SeverityLevel.LOW,
+     IssueCategory.MAINTAINABILITY, None),
+)
+
+_CPP_PATTERNS = (
+    (re.compile(r'\bnew\s+'), "Consider using smart pointers instead of raw new", SeverityLevel.MEDIUM,
+     IssueCategory.MAINTAINABILITY, None),
+    (re.compile(r'using\s+namespace\s+std;'), "Avoid 'using namespace std' in headers", SeverityLevel.MEDIUM,
+     IssueCategory.MAINTAINABILITY, None),
+    (re.compile(r'#define\s+'), "Consider using const or constexpr instead of #define", SeverityLevel.LOW,
+     IssueCategory.MAINTAINABILITY, None),
+)
+
+_C_PATTERNS = (
+    (re.compile(r'gets\('), "Never use gets() - use fgets() instead", SeverityLevel.CRITICAL,
+     IssueCategory.SECURITY, None),
+    (re.compile(r'strcpy\('), "Consider using strncpy() instead of strcpy()", SeverityLevel.HIGH,
+     IssueCategory.RELIABILITY, None),
+    (re.compile(r'malloc\(.*\)\s*;(?!.*free\()'), "Potential memory leak - missing free()", SeverityLevel.HIGH,
+     IssueCategory.RELIABILITY, None),
+)
+
+# Line pattern tables checked in streamed large files, by extension: the
+# language's own table and one whose issues are reported after it
+_STREAMED_LINE_PATTERNS = {
+    ".js": (_JS_PATTERNS, ()),
+    ".jsx": (_JS_PATTERNS, ()),
+    ".ts": (_JS_PATTERNS, _TS_PATTERNS),
+    ".tsx": (_JS_PATTERNS, _TS_PATTERNS),
+    ".go": (_GO_PATTERNS, ()),
+    ".rs": (_RUST_PATTERNS, ()),
+    ".java": (_JAVA_PATTERNS, ()),
+    ".cpp": (_CPP_PATTERNS, ()),
+    ".c": (_C_PATTERNS, ()),
+}
+
+# Keywords counted by the non-Python complexity heuristic in calculate_metrics
+_COMPLEXITY_KEYWORD_PATTERN = re.compile(
+    r'\b(if|elif|else|for|while|except|catch|case|default)\b'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _combined_line_pattern(patterns: tuple) -> re.Pattern:
+    """One alternation of every regex in a (flag-free) line pattern table"""
+    return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, *_ in patterns))
+
+
+def _candidate_lines(lines: List[str], patterns: tuple) -> Iterator[int]:
+    """
+    Yield the indices of lines that may match a line pattern table.
+    
+    The lines are scanned once with the combined alternation, joined by
+    '\\n\\0': '.' stops at the newline and nothing in the tables matches the
+    NUL, so lookaheads see a line end there just as on the line alone. Any
+    per-line match therefore also matches in the joined text, and the
+    leftmost-match scan reaches or overlaps it: every line touched by a match
+    is a candidate and no matching line is missed. Callers confirm
+    candidates with the individual patterns.
+    """
+    line_starts = None
+    next_line = 0
+    for match in _combined_line_pattern(patterns).finditer('\n\0'.join(lines)):
+        if line_starts is None:
+            line_starts = [0]
+            line_starts.extend(itertools.accumulate(len(line) + 2 for line in lines))
+        first = max(bisect.bisect_right(line_starts, match.start()) - 1, next_line)
+        last = bisect.bisect_right(line_starts, match.end() - 1) - 1
+        yield from range(first, last + 1)
+        next_line = max(next_line, last + 1)
+
+
+def _count_lines(metrics: CodeMetrics, lines: Iterable[str]) -> None:
+    """Add the total, blank and comment lines among lines to metrics"""
+    # The first character rules out most lines as comments
+    total = blank_lines = comment_lines = 0
+    for line in lines:
+        total += 1
+        stripped = line.strip()
+        if not stripped:
+            blank_lines += 1
+        elif stripped[0] in '#/*' and stripped.startswith(('#', '//', '/*', '*')):
+            comment_lines += 1
+    metrics.lines_of_code += total
+    metrics.blank_lines += blank_lines
+    metrics.comment_lines += comment_lines
+
+
+def _keyword_complexity(lines: Iterable[str]) -> int:
+    """Estimate cyclomatic complexity by counting the distinct complexity keywords on each line"""
+    return sum(len(set(_COMPLEXITY_KEYWORD_PATTERN.findall(line))) for line in lines)
+
+
+def _set_maintainability_index(metrics: CodeMetrics) -> None:
+    """Calculate the maintainability index from the other metrics"""
+    # MI = 171 - 5.2 * ln(V) - 0.23 * G - 16.2 * ln(L)
+    if metrics.lines_of_code > 0:
+        # Use Halstead volume if available, otherwise estimate
+        volume = metrics.halstead_volume if metrics.halstead_volume > 0 else metrics.lines_of_code * 2
+        metrics.maintainability_index = max(0, min(100, 
+            171 - 5.2 * math.log(max(1, volume)) 
+            - 0.23 * metrics.cyclomatic_complexity 
+            - 16.2 * math.log(max(1, metrics.lines_of_code))))
+
+
+def _find_source_files(project_path: str, file_patterns: List[str]) -> List[str]:
+    """
+    Find the files under project_path matching any of the glob patterns,
+    outside skipped directories. Name patterns share a single directory walk;
+    the result has the same paths, in the same order, as one rglob per pattern.
+    """
+    matches: List[List[str]] = [[] for _ in file_patterns]
+    name_patterns = [
+        (index, pattern) for index, pattern in enumerate(file_patterns)
+        if '/' not in pattern and os.sep not in pattern
+    ]
+    
+    if name_patterns:
+        for dir_path, dir_names, file_names in os.walk(project_path):
+            # Prune skipped directories instead of filtering every file below them
+            dir_names[:] = [name for name in dir_names if name not in _SKIP_DIRS]
+            for name in file_names:
+                for index, pattern in name_patterns:
+                    if fnmatch.fnmatch(name, pattern):
+                        matches[index].append(str(Path(dir_path, name)))
+    
+    # Patterns with a directory part still need pathlib's own matching
+    for index, pattern in enumerate(file_patterns):
+        if '/' in pattern or os.sep in pattern:
+            matches[index] = [
+                str(file_path) for file_path in Path(project_path).rglob(pattern)
+                if not _SKIP_DIRS.intersection(file_path.relative_to(project_path).parts[:-1])
+            ]
+    
+    return [file_path for paths in matches for file_path in paths]
+
+
+def _is_binary_file(file_path: str) -> bool:
+    """Whether a file looks binary: a NUL byte near its start, as git decides"""
+    try:
+        with open(file_path, 'rb') as f:
+            return b'\0' in f.read(_BINARY_SNIFF_SIZE)
+    except OSError:
+        return False  # Reported when the file is reviewed
+
+
+# Halstead operator node types. AST node classes are never subclassed, so
+# operators are tallied by exact type.
+_HALSTEAD_OPERATOR_TYPES = frozenset((
+    # Arithmetic and bitwise operators
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.LShift,
+    ast.RShift, ast.BitOr, ast.BitXor, ast.BitAnd, ast.FloorDiv,
+    # Boolean operators
+    ast.And, ast.Or, ast.Not,
+    # Comparison operators
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot,
+    ast.In, ast.NotIn,
+))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_python(content: str) -> ast.Module:
+    """
+    Parse Python source, reusing the tree for recently seen content.
+    Reviewing a file and then computing its metrics, or re-reviewing an
+    unchanged file, parses it only once. The trees must not be mutated.
+    """
+    return ast.parse(content)
+
+
+# Nodes that each add one path to cyclomatic complexity. Except handlers
+# are counted through their Try node, not again on their own.
+_CYCLOMATIC_DECISION_TYPES = frozenset((ast.If, ast.While, ast.For, ast.Assert))
+
+# Nodes that add to cognitive complexity; the first group also nests
+_COGNITIVE_NESTING_TYPES = frozenset((ast.If, ast.For, ast.While, ast.ExceptHandler))
+_COGNITIVE_TYPES = _COGNITIVE_NESTING_TYPES | {
+    ast.BoolOp, ast.Try, ast.Lambda, ast.ListComp, ast.DictComp, ast.SetComp
+}
+
+
+def _cached_on_node(attribute: str):
+    """
+    Memoize a per-node metric by storing it on the AST node itself.
+    AST nodes are not hashable, and the cache lives exactly as long as the
+    tree. Only calls at the default (zero) depth are cached; the depth may
+    be passed by position or keyword.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(node: ast.AST, *args: int, **kwargs: int):
+            if any(args) or any(kwargs.values()):
+                return func(node, *args, **kwargs)
+            cached = node.__dict__.get(attribute)
+            if cached is None:
+                cached = func(node)
+                setattr(node, attribute, cached)
+            return cached
+        return wrapper
+    return decorator
+
+
 class ComplexityAnalyzer:
     """Advanced complexity analysis for code"""
     
     @staticmethod
+    @_cached_on_node('_cyclomatic_complexity')
     def calculate_cyclomatic_complexity(node: ast.AST) -> int:
         """Calculate cyclomatic complexity using McCabe's algorithm"""
         complexity = 1  # Base complexity
         
         # Decision points that add to complexity
+        decision_types = _CYCLOMATIC_DECISION_TYPES
         for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
+            node_type = type(child)
+            if node_type in decision_types:
                 complexity += 1
-            elif isinstance(child, ast.BoolOp):
+            elif node_type is ast.BoolOp:
                 # Each AND/OR adds a path
                 complexity += len(child.values) - 1
-            elif isinstance(child, ast.Assert):
-                complexity += 1
-            elif isinstance(child, ast.comprehension):
+            elif node_type is ast.comprehension:
                 # List/dict/set comprehensions with conditions
                 complexity += len(child.ifs)
-            elif isinstance(child, ast.Try):
+            elif node_type is ast.Try:
                 # Each except handler adds a path
                 complexity += len(child.handlers)
-            elif isinstance(child, ast.With):
+            elif node_type is ast.With:
                 # Context managers can have multiple items
                 complexity += len(child.items) - 1 if len(child.items) > 1 else 0
                 
         return complexity
     
     @staticmethod
+    @_cached_on_node('_cognitive_complexity')
     def calculate_cognitive_complexity(node: ast.AST, depth: int = 0) -> int:
         """Calculate cognitive complexity (how hard code is to understand)"""
         complexity = 0
-        nesting_increment = 0
-        
-        if isinstance(node, (ast.If, ast.For, ast.While)):
-            # Control flow structures add complexity
-            complexity += 1 + depth  # Nesting penalty
-            nesting_increment = 1
-        elif isinstance(node, ast.BoolOp):
-            # Logical operators add complexity
-            complexity += 1
-            # Nested boolean operators are harder to understand
-            for value in node.values:
-                if isinstance(value, ast.BoolOp):
-                    complexity += 1
-        elif isinstance(node, ast.ExceptHandler):
-            complexity += 1 + depth
-            nesting_increment = 1
-        elif isinstance(node, ast.Lambda):
-            # Lambdas add cognitive load
-            complexity += 1
-        elif isinstance(node, (ast.ListComp, ast.DictComp, ast.SetComp)):
-            # Comprehensions can be complex
-            complexity += 1
-            if hasattr(node, 'ifs') and len(node.ifs) > 0:
-                complexity += len(node.ifs)
-        elif isinstance(node, ast.Try):
-            # Try blocks with multiple handlers
-            if len(node.handlers) > 1:
-                complexity += len(node.handlers) - 1
-                
-        # Recursively calculate for child nodes
-        for child in ast.iter_child_nodes(node):
-            complexity += ComplexityAnalyzer.calculate_cognitive_complexity(
-                child, depth + nesting_increment
-            )
+        # Walk with an explicit stack so deep trees cannot hit the recursion limit
+        stack = [(node, depth)]
+        
+        while stack:
+            node, depth = stack.pop()
+            nesting_increment = 0
             
+            # Most nodes (names, calls, attributes) match none of the rules
+            node_type = type(node)
+            if node_type not in _COGNITIVE_TYPES:
+                pass
+            elif node_type in _COGNITIVE_NESTING_TYPES:
+                # Control flow structures and except handlers add complexity
+                complexity += 1 + depth  # Nesting penalty
+                nesting_increment = 1
+            elif node_type is ast.BoolOp:
+                # Logical operators add complexity
+                complexity += 1
+                # Nested boolean operators are harder to understand
+                for value in node.values:
+                    if type(value) is ast.BoolOp:
+                        complexity += 1
+            elif node_type is ast.Try:
+                # Try blocks with multiple handlers
+                if len(node.handlers) > 1:
+                    complexity += len(node.handlers) - 1
+            else:
+                # Lambdas and comprehensions add cognitive load
+                complexity += 1
+                    
+            # Queue child nodes
+            child_depth = depth + nesting_increment
+            for child in ast.iter_child_nodes(node):
+                stack.append((child, child_depth))
+                
         return complexity
     
     @staticmethod
+    @_cached_on_node('_halstead_metrics')
     def calculate_halstead_metrics(node: ast.AST) -> Dict[str, float]:
         """Calculate Halstead complexity metrics"""
-        operators = set()
-        operands = set()
-        operator_count = 0
-        operand_count = 0
+        # Tally node types once; counting happens in C rather than per node
+        nodes = list(ast.walk(node))
+        type_counts = Counter(map(type, nodes))
         
         # Collect operators and operands
-        for child in ast.walk(node):
-            if isinstance(child, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod,
-                                ast.Pow, ast.LShift, ast.RShift, ast.BitOr,
-                                ast.BitXor, ast.BitAnd, ast.FloorDiv)):
-                operators.add(type(child).__name__)
-                operator_count += 1
-            elif isinstance(child, (ast.And, ast.Or, ast.Not)):
-                operators.add(type(child).__name__)
-                operator_count += 1
-            elif isinstance(child, (ast.Eq, ast.NotEq, ast.Lt, ast.LtE,
-                                  ast.Gt, ast.GtE, ast.Is, ast.IsNot,
-                                  ast.In, ast.NotIn)):
-                operators.add(type(child).__name__)
-                operator_count += 1
-            elif isinstance(child, ast.Name):
-                operands.add(child.id)
-                operand_count += 1
-            elif isinstance(child, (ast.Num, ast.Str, ast.Constant)):
-                if hasattr(child, 'value'):
-                    operands.add(str(child.value))
-                elif hasattr(child, 'n'):
-                    operands.add(str(child.n))
-                elif hasattr(child, 's'):
-                    operands.add(child.s)
-                operand_count += 1
-                
-        # Calculate Halstead metrics
-        n1 = len(operators)  # Unique operators
-        n2 = len(operands)   # Unique operands
-        N1 = operator_count  # Total operators
-        N2 = operand_count   # Total operands
-        
+        operator_types = _HALSTEAD_OPERATOR_TYPES.intersection(type_counts)
+        operator_count = sum(type_counts[t] for t in operator_types)
+        operands = {child.id for child in nodes if type(child) is ast.Name}
+        operands.update(str(child.value) for child in nodes if type(child) is ast.Constant)
+        operand_count = type_counts[ast.Name] + type_counts[ast.Constant]
+        
+        return ComplexityAnalyzer.halstead_from_counts(
+            len(operator_types), len(operands), operator_count, operand_count
+        )
+    
+    @staticmethod
+    def halstead_from_counts(n1: int, n2: int, N1: int, N2: int) -> Dict[str, float]:
+        """
+        Calculate Halstead metrics from the unique (n1, n2) and total (N1, N2)
+        operator and operand counts
+        """
         # Vocabulary
         n = n1 + n2
         # Program length
@@ -240,6 +582,7 @@ class ComplexityAnalyzer:
         }
     
     @staticmethod
+    @_cached_on_node('_nesting_depth')
     def calculate_nesting_depth(node: ast.AST, current_depth: int = 0) -> int:
         """Calculate maximum nesting depth"""
         max_depth = current_depth
@@ -248,21 +591,534 @@ class ComplexityAnalyzer:
         nesting_nodes = (ast.If, ast.For, ast.While, ast.With, ast.Try,
                         ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
         
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, nesting_nodes):
-                child_depth = ComplexityAnalyzer.calculate_nesting_depth(
-                    child, current_depth + 1
-                )
-                max_depth = max(max_depth, child_depth)
-            else:
-                child_depth = ComplexityAnalyzer.calculate_nesting_depth(
-                    child, current_depth
-                )
-                max_depth = max(max_depth, child_depth)
+        # Walk with an explicit stack so deep trees cannot hit the recursion limit
+        stack = [(node, current_depth)]
+        while stack:
+            node, current_depth = stack.pop()
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, nesting_nodes):
+                    child_depth = current_depth + 1
+                    max_depth = max(max_depth, child_depth)
+                else:
+                    child_depth = current_depth
+                stack.append((child, child_depth))
                 
         return max_depth
 
 
+class _FunctionMetrics:
+    """Complexity accumulators for one function while it is being visited"""
+    
+    __slots__ = ('node', 'cyclomatic', 'cognitive', 'nesting', 'cognitive_base', 'nesting_base')
+    
+    def __init__(self, node: ast.FunctionDef, cognitive_base: int, nesting_base: int):
+        self.node = node
+        self.cyclomatic = 1  # Base complexity
+        self.cognitive = 0
+        self.nesting = 0
+        self.cognitive_base = cognitive_base
+        self.nesting_base = nesting_base
+
+
+class PythonReviewVisitor(ast.NodeVisitor):
+    """
+    Single-pass Python reviewer.
+    
+    Computes cyclomatic complexity, cognitive complexity and nesting depth for
+    every function (with the same rules as ComplexityAnalyzer) and collects
+    class and Python-specific issues in one traversal of the module.
+    A node inside nested functions counts towards every enclosing function.
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.issues: List[CodeIssue] = []
+        self._functions: List[_FunctionMetrics] = []  # Enclosing functions
+        self._cognitive_depth = 0  # Enclosing if/for/while/except blocks
+        self._nesting_depth = 0    # Enclosing nesting blocks
+    
+    # Dispatch
+    
+    _handlers: Dict[type, Any] = {}  # Node type -> visit method, shared by all instances
+    _actions: Dict[type, Any] = {}   # Node type -> visit method or None, inside expressions
+    _frame_type = _FunctionMetrics    # Accumulators created for each function
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses resolve their own visit methods
+        cls._handlers = {}
+        cls._actions = {}
+    
+    @classmethod
+    def _handler(cls, node_type: type):
+        """Resolve the visit method for a node type once, instead of per node"""
+        handler = cls._handlers.get(node_type)
+        if handler is None:
+            if issubclass(node_type, ast.expr):
+                handler = cls._visit_expression
+            else:
+                handler = getattr(cls, 'visit_' + node_type.__name__, cls.generic_visit)
+            cls._handlers[node_type] = handler
+        return handler
+    
+    def visit(self, node: ast.AST):
+        return self._handler(type(node))(self, node)
+    
+    def generic_visit(self, node: ast.AST):
+        handlers = self._handlers
+        for child in ast.iter_child_nodes(node):
+            handler = handlers.get(type(child)) or self._handler(type(child))
+            handler(self, child)
+    
+    def _visit_expression(self, node: ast.expr):
+        """
+        Visit an expression tree without recursion. Expressions can nest
+        thousands deep (long operator chains) but never open a block, so each
+        node's visit method only acts on the node itself, and the children
+        are handled here in the same pre-order as generic_visit would.
+        """
+        actions = self._actions
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            try:
+                action = actions[node_type]
+            except KeyError:
+                action = actions[node_type] = getattr(type(self), 'visit_' + node_type.__name__, None)
+            if action is not None:
+                action(self, node)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    
+    # Accumulation helpers
+    
+    def _add_cyclomatic(self, amount: int):
+        for function in self._functions:
+            function.cyclomatic += amount
+    
+    def _add_cognitive(self, amount: int, nested: bool = False):
+        for function in self._functions:
+            function.cognitive += amount
+            if nested:
+                # Nesting penalty relative to each enclosing function
+                function.cognitive += self._cognitive_depth - function.cognitive_base
+    
+    def _visit_nested(self, node: ast.AST, cognitive: bool = False, nesting: bool = False):
+        """Visit children one level deeper in the cognitive and/or nesting sense"""
+        if nesting:
+            self._nesting_depth += 1
+            for function in self._functions:
+                depth = self._nesting_depth - function.nesting_base
+                if depth > function.nesting:
+                    function.nesting = depth
+        if cognitive:
+            self._cognitive_depth += 1
+        
+        self.generic_visit(node)
+        
+        if cognitive:
+            self._cognitive_depth -= 1
+        if nesting:
+            self._nesting_depth -= 1
+    
+    # Definitions
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        # Check for mutable default arguments
+        for default in node.args.defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self.issues.append(CodeIssue(
+                    file=self.file_path,
+                    line=node.lineno,
+                    column=None,
+                    severity=SeverityLevel.HIGH,
+                    category=IssueCategory.RELIABILITY,
+                    message=f"Mutable default argument in function '{node.name}'",
+                    suggestion="Use None as default and create the mutable object inside the function",
+                    rule="mutable-default-argument"
+                ))
+        
+        metrics = self._frame_type(node, self._cognitive_depth, self._nesting_depth + 1)
+        self._functions.append(metrics)
+        self._visit_nested(node, nesting=True)
+        self._functions.pop()
+        
+        self._check_function(metrics)
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_nested(node, nesting=True)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        # Class complexity
+        methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
+        if len(methods) > 20:
+            self.issues.append(CodeIssue(
+                file=self.file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.HIGH,
+                category=IssueCategory.MAINTAINABILITY,
+                message=f"Class '{node.name}' has too many methods ({len(methods)})",
+                suggestion="Consider splitting into multiple classes or using composition",
+                rule="max-class-methods"
+            ))
+        
+        # Check for missing class docstring
+        if not ast.get_docstring(node):
+            self.issues.append(CodeIssue(
+                file=self.file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.LOW,
+                category=IssueCategory.DOCUMENTATION,
+                message=f"Missing docstring for class '{node.name}'",
+                suggestion="Add a docstring describing the class purpose and usage",
+                rule="missing-class-docstring"
+            ))
+        
+        self._visit_nested(node, nesting=True)
+    
+    # Control flow
+    
+    def visit_If(self, node: ast.AST):
+        self._add_cyclomatic(1)
+        self._add_cognitive(1, nested=True)
+        self._visit_nested(node, cognitive=True, nesting=True)
+    
+    visit_For = visit_If
+    visit_While = visit_If
+    
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        # Check for bare except
+        if node.type is None:
+            self.issues.append(CodeIssue(
+                file=self.file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.MEDIUM,
+                category=IssueCategory.RELIABILITY,
+                message="Bare except clause catches all exceptions",
+                suggestion="Specify the exception types you want to catch",
+                rule="bare-except"
+            ))
+        
+        # The path is counted through the enclosing Try
+        self._add_cognitive(1, nested=True)
+        self._visit_nested(node, cognitive=True)
+    
+    def visit_Try(self, node: ast.Try):
+        # Each except handler adds a path
+        self._add_cyclomatic(len(node.handlers))
+        if len(node.handlers) > 1:
+            self._add_cognitive(len(node.handlers) - 1)
+        self._visit_nested(node, nesting=True)
+    
+    def visit_With(self, node: ast.With):
+        # Context managers can have multiple items
+        if len(node.items) > 1:
+            self._add_cyclomatic(len(node.items) - 1)
+        self._visit_nested(node, nesting=True)
+    
+    def visit_Assert(self, node: ast.Assert):
+        self._add_cyclomatic(1)
+        self.generic_visit(node)
+    
+    # Expressions, visited by _visit_expression: children are not visited here
+    
+    def visit_BoolOp(self, node: ast.BoolOp):
+        # Each AND/OR adds a path; nested boolean operators are harder to understand
+        self._add_cyclomatic(len(node.values) - 1)
+        self._add_cognitive(1 + sum(1 for value in node.values if isinstance(value, ast.BoolOp)))
+    
+    def visit_comprehension(self, node: ast.comprehension):
+        # Comprehensions with conditions
+        self._add_cyclomatic(len(node.ifs))
+    
+    def visit_Lambda(self, node: ast.AST):
+        # Lambdas and comprehensions add cognitive load
+        self._add_cognitive(1)
+    
+    visit_ListComp = visit_Lambda
+    visit_DictComp = visit_Lambda
+    visit_SetComp = visit_Lambda
+    
+    def visit_Call(self, node: ast.Call):
+        # Check for eval usage
+        if isinstance(node.func, ast.Name) and node.func.id in ['eval', 'exec']:
+            self.issues.append(CodeIssue(
+                file=self.file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.CRITICAL,
+                category=IssueCategory.SECURITY,
+                message=f"Use of {node.func.id}() is a security risk",
+                suggestion="Avoid eval/exec or use ast.literal_eval for safe evaluation",
+                rule="no-eval"
+            ))
+    
+    # Per-function issues
+    
+    def _check_function(self, metrics: _FunctionMetrics):
+        """Report issues for a function once its subtree has been visited"""
+        node = metrics.node
+        file_path = self.file_path
+        
+        # Cyclomatic complexity
+        cyclomatic = metrics.cyclomatic
+        if cyclomatic > 10:
+            self.issues.append(CodeIssue(
+                file=file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.HIGH if cyclomatic > 15 else SeverityLevel.MEDIUM,
+                category=IssueCategory.COMPLEXITY,
+                message=f"High cyclomatic complexity ({cyclomatic}) for function '{node.name}'",
+                suggestion="Consider breaking this function into smaller, more focused functions",
+                rule="cyclomatic-complexity"
+            ))
+        
+        # Cognitive complexity
+        cognitive = metrics.cognitive
+        if cognitive > 15:
+            self.issues.append(CodeIssue(
+                file=file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.HIGH if cognitive > 25 else SeverityLevel.MEDIUM,
+                category=IssueCategory.COMPLEXITY,
+                message=f"High cognitive complexity ({cognitive}) for function '{node.name}'",
+                suggestion="Simplify the logic to make it easier to understand",
+                rule="cognitive-complexity"
+            ))
+        
+        # Nesting depth
+        nesting = metrics.nesting
+        if nesting > 4:
+            self.issues.append(CodeIssue(
+                file=file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.MEDIUM,
+                category=IssueCategory.COMPLEXITY,
+                message=f"Deep nesting level ({nesting}) in function '{node.name}'",
+                suggestion="Reduce nesting by using early returns or extracting nested logic",
+                rule="max-nesting-depth"
+            ))
+        
+        # Function length
+        func_lines = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
+        if func_lines > 50:
+            self.issues.append(CodeIssue(
+                file=file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.MEDIUM if func_lines <= 100 else SeverityLevel.HIGH,
+                category=IssueCategory.MAINTAINABILITY,
+                message=f"Function '{node.name}' is too long ({func_lines} lines)",
+                suggestion="Consider splitting into smaller functions",
+                rule="max-function-length"
+            ))
+        
+        # Check for missing docstring
+        if not ast.get_docstring(node):
+            self.issues.append(CodeIssue(
+                file=file_path,
+                line=node.lineno,
+                column=None,
+                severity=SeverityLevel.LOW,
+                category=IssueCategory.DOCUMENTATION,
+                message=f"Missing docstring for function '{node.name}'",
+                suggestion="Add a docstring describing the function's purpose, parameters, and return value",
+                rule="missing-docstring"
+            ))
+
+
+class _FunctionHalstead(_FunctionMetrics):
+    """Function accumulators that also collect Halstead operators and operands"""
+    
+    __slots__ = ('operators', 'operands', 'operator_count', 'operand_count')
+    
+    def __init__(self, node: ast.FunctionDef, cognitive_base: int, nesting_base: int):
+        super().__init__(node, cognitive_base, nesting_base)
+        self.operators = set()
+        self.operands = set()
+        self.operator_count = 0
+        self.operand_count = 0
+
+
+class PythonMetricsVisitor(PythonReviewVisitor):
+    """
+    Single-pass Python metrics.
+    
+    Sums the per-function complexity of PythonReviewVisitor and each function's
+    Halstead metrics over the module, counts functions and classes and tracks
+    the module's maximum nesting depth, matching what ComplexityAnalyzer gives
+    for each function and for the whole tree.
+    """
+    
+    _frame_type = _FunctionHalstead
+    
+    def __init__(self):
+        super().__init__("")
+        self.functions = 0
+        self.classes = 0
+        self.cyclomatic_complexity = 0
+        self.cognitive_complexity = 0
+        self.halstead_volume = 0.0
+        self.halstead_difficulty = 0.0
+        self.halstead_effort = 0.0
+        self.max_nesting_depth = 0
+    
+    def _visit_nested(self, node: ast.AST, cognitive: bool = False, nesting: bool = False):
+        if nesting and self._nesting_depth >= self.max_nesting_depth:
+            self.max_nesting_depth = self._nesting_depth + 1
+        super()._visit_nested(node, cognitive, nesting)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes += 1
+        super().visit_ClassDef(node)
+    
+    # Halstead operands and operators
+    
+    def visit_Name(self, node: ast.Name):
+        for function in self._functions:
+            function.operands.add(node.id)
+            function.operand_count += 1
+    
+    def visit_Constant(self, node: ast.Constant):
+        for function in self._functions:
+            function.operands.add(str(node.value))
+            function.operand_count += 1
+    
+    def _visit_operator(self, node: ast.AST):
+        for function in self._functions:
+            function.operators.add(type(node).__name__)
+            function.operator_count += 1
+    
+    def _check_function(self, metrics: _FunctionHalstead):
+        """Add a function's metrics to the module totals once it has been visited"""
+        self.functions += 1
+        self.cyclomatic_complexity += metrics.cyclomatic
+        self.cognitive_complexity += metrics.cognitive
+        
+        halstead = ComplexityAnalyzer.halstead_from_counts(
+            len(metrics.operators), len(metrics.operands),
+            metrics.operator_count, metrics.operand_count
+        )
+        self.halstead_volume += halstead['volume']
+        self.halstead_difficulty += halstead['difficulty']
+        self.halstead_effort += halstead['effort']
+
+
+for _operator_type in _HALSTEAD_OPERATOR_TYPES:
+    setattr(PythonMetricsVisitor, 'visit_' + _operator_type.__name__, PythonMetricsVisitor._visit_operator)
+del _operator_type
+
+
+class ReviewCache:
+    """
+    Review results of a project's files, persisted between runs.
+    
+    Entries are keyed by path and validated by modification time and size,
+    falling back to a content digest so touched but unchanged files still
+    hit. Results are stored as JSON rather than pickled, so a tampered cache
+    file cannot run code. The database lives in the user's cache directory,
+    named after the resolved project path, and never inside the project.
+    
+    A database locked by another review or otherwise failing only costs
+    the affected files a fresh review.
+    """
+    
+    def __init__(self, project_path: str):
+        cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        cache_dir = Path(cache_home) / _REVIEW_CACHE_DIR
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        project_key = hashlib.blake2b(
+            os.fsencode(Path(project_path).resolve()), digest_size=16
+        ).hexdigest()
+        self.connection = sqlite3.connect(cache_dir / f'{project_key}.sqlite3')
+        
+        with self.connection:
+            # Results from an older reviewer are not reusable
+            version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != _REVIEW_CACHE_VERSION:
+                self.connection.execute('DROP TABLE IF EXISTS reviews')
+                self.connection.execute(f'PRAGMA user_version = {_REVIEW_CACHE_VERSION}')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS reviews ('
+                'path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest BLOB, '
+                'issues TEXT, metrics TEXT)'
+            )
+    
+    @staticmethod
+    def _digest(file_path: str) -> bytes:
+        with open(file_path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).digest()
+    
+    def fingerprint(self, file_path: str) -> Optional[Tuple[int, int, bytes]]:
+        """Modification time, size and digest of a file, or None if it cannot be read"""
+        try:
+            stat = os.stat(file_path)
+            return stat.st_mtime_ns, stat.st_size, self._digest(file_path)
+        except OSError:
+            return None
+    
+    def get(self, file_path: str) -> Optional[Tuple[List[CodeIssue], CodeMetrics]]:
+        """Cached issues and metrics for a file, or None if it changed since or the cache failed"""
+        try:
+            row = self.connection.execute(
+                'SELECT mtime_ns, size, digest, issues, metrics FROM reviews WHERE path = ?',
+                (file_path,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            mtime_ns, size, digest, issues, metrics = row
+            stat = os.stat(file_path)
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                # Only the digest tells whether a touched file really changed
+                if stat.st_size != size or self._digest(file_path) != digest:
+                    return None
+                with self.connection:
+                    self.connection.execute(
+                        'UPDATE reviews SET mtime_ns = ? WHERE path = ?',
+                        (stat.st_mtime_ns, file_path)
+                    )
+        except OSError:
+            return None
+        except sqlite3.Error as e:
+            logger.warning(f"Review cache lookup failed for {file_path}: {e}")
+            return None
+        
+        return [
+            CodeIssue(**{
+                **issue,
+                'severity': SeverityLevel(issue['severity']),
+                'category': IssueCategory(issue['category']),
+            })
+            for issue in json.loads(issues)
+        ], CodeMetrics(**json.loads(metrics))
+    
+    def put(self, file_path: str, fingerprint: Tuple[int, int, bytes],
+            issues: List[CodeIssue], metrics: CodeMetrics):
+        """Store a file's results under the fingerprint taken before reviewing it"""
+        issues_json = json.dumps([
+            {**asdict(issue), 'severity': issue.severity.value, 'category': issue.category.value}
+            for issue in issues
+        ])
+        try:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?)',
+                    (file_path, *fingerprint, issues_json, json.dumps(asdict(metrics)))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Review cache update failed for {file_path}: {e}")
+    
+    def close(self):
+        self.connection.close()
+
+
 class CodeReviewAgent(BaseAgent):
     """
     Agent responsible for code review and quality analysis
@@ -282,6 +1138,10 @@ class CodeReviewAgent(BaseAgent):
         self.execution_limiter = execution_limiter
         self.language_analyzers = self._initialize_analyzers()
         self.complexity_analyzer = ComplexityAnalyzer()
+        # Path -> ((mtime_ns, size), content, lines), least recently used first
+        self._source_cache: OrderedDict[str, Tuple[Tuple[int, int], str, List[str]]] = OrderedDict()
+        # Worker processes for parallel reviews, started on first use
+        self._executor: Optional[ProcessPoolExecutor] = None
     
     def _initialize_analyzers(self) -> Dict[str, Any]:
         """Initialize language-specific analyzers"""
@@ -299,24 +1159,58 @@ class CodeReviewAgent(BaseAgent):
             ".c": self._analyze_c,
         }
     
+    def _read_source(self, file_path: str) -> Tuple[str, List[str]]:
+        """
+        Read a file's content and lines, reusing them while its modification
+        time and size are unchanged. Python trees are reused separately by
+        content, so an unchanged file is also parsed only once.
+        """
+        stat = os.stat(file_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._source_cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            self._source_cache.move_to_end(file_path)
+            return cached[1], cached[2]
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        lines = content.splitlines()
+        
+        # Large files are not worth holding on to
+        if stat.st_size <= _LARGE_FILE_SIZE:
+            self._source_cache[file_path] = (key, content, lines)
+            if len(self._source_cache) > _SOURCE_CACHE_SIZE:
+                self._source_cache.popitem(last=False)
+        
+        return content, lines
+    
     async def review_file(self, file_path: str) -> List[CodeIssue]:
         """Review a single file"""
         logger.info(f"Reviewing file: {file_path}")
         issues = []
         
         # Check if file exists
-        if not Path(file_path).exists():
+        path = Path(file_path)
+        if not path.exists():
             logger.error(f"File not found: {file_path}")
             return issues
         
         # Get file extension
-        ext = Path(file_path).suffix.lower()
+        ext = path.suffix.lower()
+        
+        # Very large files (bundled or generated code) are streamed so the
+        # whole file is never held in memory
+        if path.stat().st_size > _LARGE_FILE_SIZE:
+            try:
+                return self._review_large_file(file_path)[0]
+            except Exception as e:
+                logger.error(f"Error reading file {file_path}: {e}")
+                return issues
         
         # Read file content
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.splitlines()
+            content, lines = self._read_source(file_path)
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
             return issues
@@ -325,9 +1219,9 @@ class CodeReviewAgent(BaseAgent):
         issues.extend(self._check_common_issues(file_path, content, lines))
         
         # Language-specific analysis
-        if ext in self.language_analyzers:
-            analyzer = self.language_analyzers[ext]
-            language_issues = await analyzer(file_path, content, lines)
+        analyzer = self.language_analyzers.get(ext)
+        if analyzer is not None:
+            language_issues = analyzer(file_path, content, lines)
             issues.extend(language_issues)
         else:
             # Generic analysis for unsupported languages
@@ -335,36 +1229,148 @@ class CodeReviewAgent(BaseAgent):
         
         return issues
     
-    def _check_common_issues(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
-        """Check for common issues across all languages"""
-        issues = []
+    def _review_large_file(self, file_path: str) -> Tuple[List[CodeIssue], CodeMetrics]:
+        """
+        Review and measure a large file in one pass over blocks of its lines:
+        the common checks, the language's line patterns and the line-based
+        metrics. Python syntax trees and JavaScript complexity are skipped.
+        """
+        patterns, extra_patterns = _STREAMED_LINE_PATTERNS.get(Path(file_path).suffix.lower(), ((), ()))
+        language_issues = []
+        extra_issues = []
+        metrics = CodeMetrics()
         
-        # Check for sensitive information
-        sensitive_patterns = [
-            (r'(?i)(api[_-]?key|apikey)\s*=\s*["\'][\w\-]+["\']', "API key exposed"),
-            (r'(?i)(secret|password|passwd|pwd)\s*=\s*["\'][^"\']+["\']', "Password/secret exposed"),
-            (r'(?i)token\s*=\s*["\'][\w\-\.]+["\']', "Token exposed"),
-            (r'(?i)private[_-]?key\s*=\s*["\'][^"\']+["\']', "Private key exposed"),
-        ]
+        def stream(f) -> Iterator[str]:
+            offset = 0
+            while True:
+                block = [line.rstrip('\n') for line in itertools.islice(f, _STREAM_BLOCK_LINES)]
+                if not block:
+                    return
+                if patterns:
+                    language_issues.extend(self._match_line_patterns(file_path, block, patterns, offset))
+                if extra_patterns:
+                    extra_issues.extend(self._match_line_patterns(file_path, block, extra_patterns, offset))
+                _count_lines(metrics, block)
+                metrics.cyclomatic_complexity += _keyword_complexity(block)
+                yield from block
+                offset += len(block)
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            issues = list(self._check_common_issues(file_path, "", stream(f)))
+        
+        _set_maintainability_index(metrics)
+        return issues + language_issues + extra_issues, metrics
+    
+    async def review_files(
+        self,
+        file_paths: List[str],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, List[CodeIssue]]:
+        """Review several files in parallel worker processes"""
+        if len(file_paths) < 2:
+            return {file_path: await self.review_file(file_path) for file_path in file_paths}
+        
+        results = await self._run_in_workers(_review_file_worker, file_paths, max_workers)
+        return dict(zip(file_paths, results))
+    
+    async def _run_in_workers(
+        self,
+        worker,
+        file_paths: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Run a module-level worker function on each file in the agent's process
+        pool, in order. At most max_workers files (one per CPU by default) are
+        handed to the pool at once, so no more workers start than there are files.
+        """
+        # Analysis is CPU-bound Python, so threads would serialize on the GIL
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context(_WORKER_START_METHOD)
+            )
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(min(len(file_paths), max_workers or os.cpu_count() or 1))
         
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message in sensitive_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=SeverityLevel.CRITICAL,
-                        category=IssueCategory.SECURITY,
-                        message=message,
-                        suggestion="Move sensitive data to environment variables or secure configuration",
-                        code_snippet=line.strip()
-                    ))
+        async def run(file_path: str) -> Any:
+            async with slots:
+                return await loop.run_in_executor(executor, worker, file_path)
+        
+        try:
+            return await asyncio.gather(*[run(file_path) for file_path in file_paths])
+        except BrokenProcessPool:
+            # A worker died; the next call starts a fresh pool
+            if self._executor is executor:
+                self._executor = None
+            raise
+    
+    def cleanup(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+    
+    async def _review_and_measure(self, file_path: str) -> Tuple[List[CodeIssue], Optional[CodeMetrics]]:
+        """Review a file and calculate its metrics; metrics are None if it cannot be read or is binary"""
+        if _is_binary_file(file_path):
+            logger.info(f"Skipping binary file: {file_path}")
+            return [], None
         
-        # Check for TODO/FIXME comments
+        try:
+            if os.path.getsize(file_path) > _LARGE_FILE_SIZE:
+                # Reviewed and measured in a single streamed pass
+                return self._review_large_file(file_path)
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            return [], None
+        
+        issues = await self.review_file(file_path)
+        
+        try:
+            # Reuses the content read by review_file
+            content, lines = self._read_source(file_path)
+            return issues, self.calculate_metrics(content, lines)
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            return issues, None
+    
+    def _check_common_issues(self, file_path: str, content: str, lines: Iterable[str]) -> Iterator[CodeIssue]:
+        """Check for common issues across all languages"""
+        max_line_length = 120
+        
+        # Single pass over the file; every check is evaluated per line
         for line_num, line in enumerate(lines, 1):
-            if re.search(r'\b(TODO|FIXME|HACK|XXX)\b', line, re.IGNORECASE):
-                issues.append(CodeIssue(
+            if not line:
+                continue
+            
+            # Check for sensitive information (every pattern is an assignment)
+            match = _SENSITIVE_PATTERN.search(line) if '=' in line else None
+            if match:
+                # A line may leak more than one kind of secret, none of them
+                # starting before the first match
+                start = match.start()
+                for pattern, message in _SENSITIVE_KIND_PATTERNS:
+                    if pattern.search(line, start):
+                        yield CodeIssue(
+                            file=file_path,
+                            line=line_num,
+                            column=None,
+                            severity=SeverityLevel.CRITICAL,
+                            category=IssueCategory.SECURITY,
+                            message=message,
+                            suggestion="Move sensitive data to environment variables or secure configuration",
+                            code_snippet=line.strip()
+                        )
+            
+            # Check for TODO/FIXME comments. A substring test rules out most
+            # lines first; non-ASCII lines always go to the case-insensitive
+            # regex, which also matches e.g. a dotted capital I.
+            lowered = line.lower()
+            if (('todo' in lowered or 'fixme' in lowered or 'hack' in lowered or 'xxx' in lowered
+                 or not line.isascii()) and _TODO_PATTERN.search(line)):
+                yield CodeIssue(
                     file=file_path,
                     line=line_num,
                     column=None,
@@ -373,13 +1379,11 @@ class CodeReviewAgent(BaseAgent):
                     message="Unresolved TODO/FIXME comment",
                     suggestion="Address the TODO or create a tracking issue",
                     code_snippet=line.strip()
-                ))
-        
-        # Check line length
-        max_line_length = 120
-        for line_num, line in enumerate(lines, 1):
+                )
+            
+            # Check line length
             if len(line) > max_line_length:
-                issues.append(CodeIssue(
+                yield CodeIssue(
                     file=file_path,
                     line=line_num,
                     column=max_line_length,
@@ -388,12 +1392,11 @@ class CodeReviewAgent(BaseAgent):
                     message=f"Line too long ({len(line)} > {max_line_length} characters)",
                     suggestion="Break long lines for better readability",
                     code_snippet=line[:50] + "..."
-                ))
-        
-        # Check for trailing whitespace
-        for line_num, line in enumerate(lines, 1):
+                )
+            
+            # Check for trailing whitespace
             if line.endswith((' ', '\t')):
-                issues.append(CodeIssue(
+                yield CodeIssue(
                     file=file_path,
                     line=line_num,
                     column=len(line.rstrip()),
@@ -402,123 +1405,14 @@ class CodeReviewAgent(BaseAgent):
                     message="Trailing whitespace",
                     suggestion="Remove trailing whitespace",
                     rule="no-trailing-spaces"
-                ))
-        
-        return issues
+                )
     
-    async def _analyze_python(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_python(self, file_path: str, content: str, lines: List[str]) -> Iterable[CodeIssue]:
         """Analyze Python code"""
-        issues = []
-        
         try:
-            tree = ast.parse(content)
-            
-            # Analyze functions and methods
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Cyclomatic complexity
-                    cyclomatic = self.complexity_analyzer.calculate_cyclomatic_complexity(node)
-                    if cyclomatic > 10:
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.HIGH if cyclomatic > 15 else SeverityLevel.MEDIUM,
-                            category=IssueCategory.COMPLEXITY,
-                            message=f"High cyclomatic complexity ({cyclomatic}) for function '{node.name}'",
-                            suggestion="Consider breaking this function into smaller, more focused functions",
-                            rule="cyclomatic-complexity"
-                        ))
-                    
-                    # Cognitive complexity
-                    cognitive = self.complexity_analyzer.calculate_cognitive_complexity(node)
-                    if cognitive > 15:
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.HIGH if cognitive > 25 else SeverityLevel.MEDIUM,
-                            category=IssueCategory.COMPLEXITY,
-                            message=f"High cognitive complexity ({cognitive}) for function '{node.name}'",
-                            suggestion="Simplify the logic to make it easier to understand",
-                            rule="cognitive-complexity"
-                        ))
-                    
-                    # Nesting depth
-                    nesting = self.complexity_analyzer.calculate_nesting_depth(node)
-                    if nesting > 4:
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.MEDIUM,
-                            category=IssueCategory.COMPLEXITY,
-                            message=f"Deep nesting level ({nesting}) in function '{node.name}'",
-                            suggestion="Reduce nesting by using early returns or extracting nested logic",
-                            rule="max-nesting-depth"
-                        ))
-                    
-                    # Function length
-                    func_lines = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
-                    if func_lines > 50:
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.MEDIUM if func_lines <= 100 else SeverityLevel.HIGH,
-                            category=IssueCategory.MAINTAINABILITY,
-                            message=f"Function '{node.name}' is too long ({func_lines} lines)",
-                            suggestion="Consider splitting into smaller functions",
-                            rule="max-function-length"
-                        ))
-                    
-                    # Check for missing docstring
-                    if not ast.get_docstring(node):
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.LOW,
-                            category=IssueCategory.DOCUMENTATION,
-                            message=f"Missing docstring for function '{node.name}'",
-                            suggestion="Add a docstring describing the function's purpose, parameters, and return value",
-                            rule="missing-docstring"
-                        ))
-                
-                # Check classes
-                elif isinstance(node, ast.ClassDef):
-                    # Class complexity
-                    methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-                    if len(methods) > 20:
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.HIGH,
-                            category=IssueCategory.MAINTAINABILITY,
-                            message=f"Class '{node.name}' has too many methods ({len(methods)})",
-                            suggestion="Consider splitting into multiple classes or using composition",
-                            rule="max-class-methods"
-                        ))
-                    
-                    # Check for missing class docstring
-                    if not ast.get_docstring(node):
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.LOW,
-                            category=IssueCategory.DOCUMENTATION,
-                            message=f"Missing docstring for class '{node.name}'",
-                            suggestion="Add a docstring describing the class purpose and usage",
-                            rule="missing-class-docstring"
-                        ))
-            
-            # Python-specific issues
-            issues.extend(self._check_python_specific_issues(tree, file_path))
-            
+            tree = _parse_python(content)
         except SyntaxError as e:
-            issues.append(CodeIssue(
+            return [CodeIssue(
                 file=file_path,
                 line=e.lineno or 1,
                 column=e.offset,
@@ -526,133 +1420,97 @@ class CodeReviewAgent(BaseAgent):
                 category=IssueCategory.RELIABILITY,
                 message=f"Syntax error: {e.msg}",
                 suggestion="Fix the syntax error before proceeding"
-            ))
+            )]
         
-        return issues
+        # Function, class and Python-specific checks in a single traversal
+        visitor = PythonReviewVisitor(file_path)
+        visitor.visit(tree)
+        return visitor.issues
     
-    def _check_python_specific_issues(self, tree: ast.AST, file_path: str) -> List[CodeIssue]:
-        """Check for Python-specific code issues"""
-        issues = []
-        
-        for node in ast.walk(tree):
-            # Check for bare except
-            if isinstance(node, ast.ExceptHandler) and node.type is None:
-                issues.append(CodeIssue(
-                    file=file_path,
-                    line=node.lineno,
-                    column=None,
-                    severity=SeverityLevel.MEDIUM,
-                    category=IssueCategory.RELIABILITY,
-                    message="Bare except clause catches all exceptions",
-                    suggestion="Specify the exception types you want to catch",
-                    rule="bare-except"
-                ))
-            
-            # Check for eval usage
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id in ['eval', 'exec']:
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=node.lineno,
-                        column=None,
-                        severity=SeverityLevel.CRITICAL,
-                        category=IssueCategory.SECURITY,
-                        message=f"Use of {node.func.id}() is a security risk",
-                        suggestion="Avoid eval/exec or use ast.literal_eval for safe evaluation",
-                        rule="no-eval"
-                    ))
-            
-            # Check for mutable default arguments
-            elif isinstance(node, ast.FunctionDef):
-                for default in node.args.defaults:
-                    if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        issues.append(CodeIssue(
-                            file=file_path,
-                            line=node.lineno,
-                            column=None,
-                            severity=SeverityLevel.HIGH,
-                            category=IssueCategory.RELIABILITY,
-                            message=f"Mutable default argument in function '{node.name}'",
-                            suggestion="Use None as default and create the mutable object inside the function",
-                            rule="mutable-default-argument"
-                        ))
-        
-        return issues
+    def _analyze_javascript(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
+        """Analyze JavaScript code"""
+        return self._analyze_js_like(file_path, content, lines)
     
-    async def _analyze_javascript(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
-        """Analyze JavaScript/TypeScript code"""
-        issues = []
-        
-        # JavaScript-specific patterns
-        js_patterns = [
-            (r'==(?!=)', "Use === for strict equality", SeverityLevel.MEDIUM),
-            (r'!=(?!=)', "Use !== for strict inequality", SeverityLevel.MEDIUM),
-            (r'\bvar\s+', "Use 'const' or 'let' instead of 'var'", SeverityLevel.LOW),
-            (r'console\.(log|debug|info)', "Remove console statements", SeverityLevel.LOW),
-            (r'debugger;', "Remove debugger statement", SeverityLevel.HIGH),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in js_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
+    def _analyze_js_like(self, file_path: str, content: str, lines: List[str],
+                         extra_patterns: tuple = ()) -> Iterator[CodeIssue]:
+        """
+        Analyze JavaScript and its dialects in a single pass over the lines.
+        Issues from extra_patterns are reported after the JavaScript ones.
+        """
+        extra_issues = []
+        
+        patterns = [(pattern, message, severity, category, suggestion, False)
+                    for pattern, message, severity, category, suggestion in _JS_PATTERNS]
+        patterns += [(pattern, message, severity, category, suggestion, True)
+                     for pattern, message, severity, category, suggestion in extra_patterns]
+        
+        for index in _candidate_lines(lines, _JS_PATTERNS + extra_patterns):
+            line = lines[index]
+            for pattern, message, severity, category, suggestion, extra in patterns:
+                if pattern.search(line):
+                    issue = CodeIssue(
                         file=file_path,
-                        line=line_num,
+                        line=index + 1,
                         column=None,
                         severity=severity,
-                        category=IssueCategory.STYLE if severity == SeverityLevel.LOW else IssueCategory.RELIABILITY,
+                        category=category,
                         message=message,
+                        suggestion=suggestion,
                         code_snippet=line.strip()
-                    ))
+                    )
+                    if extra:
+                        extra_issues.append(issue)
+                    else:
+                        yield issue
         
         # Complexity analysis for JavaScript (simplified without AST)
-        issues.extend(self._analyze_javascript_complexity(file_path, content, lines))
-        
-        return issues
+        yield from self._analyze_javascript_complexity(file_path, content)
+        yield from extra_issues
     
-    def _analyze_javascript_complexity(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_javascript_complexity(self, file_path: str, content: str) -> Iterator[CodeIssue]:
         """Analyze JavaScript complexity using pattern matching"""
-        issues = []
-        
         # Find functions and analyze their complexity
-        function_pattern = r'(?:function\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>))'
-        
-        for match in re.finditer(function_pattern, content):
+        scanned_pos = 0
+        scanned_line = 1
+        literal_starts = literal_ends = None
+        for match in _JS_FUNCTION_PATTERN.finditer(content):
+            # Skip mentions of functions in strings, templates and comments
+            if literal_starts is None:
+                literals = [token.span() for token in _JS_BRACKET_TOKEN_PATTERN.finditer(content)
+                            if token.end() - token.start() > 1]
+                literal_starts = [start for start, _ in literals]
+                literal_ends = [end for _, end in literals]
+            index = bisect.bisect_right(literal_starts, match.start()) - 1
+            if index >= 0 and match.start() < literal_ends[index]:
+                continue
+            
             func_name = match.group(1) or match.group(2)
-            func_start = content[:match.start()].count('\n') + 1
             
-            # Find the function body (simplified)
-            brace_count = 0
-            func_end = func_start
-            in_function = False
+            # Line numbers are counted incrementally between matches
+            scanned_line += content.count('\n', scanned_pos, match.start())
+            scanned_pos = match.start()
+            func_start = scanned_line
             
-            for i, line in enumerate(lines[func_start - 1:], func_start):
-                if '{' in line:
-                    brace_count += line.count('{')
-                    in_function = True
-                if '}' in line and in_function:
-                    brace_count -= line.count('}')
-                    if brace_count <= 0:
-                        func_end = i
-                        break
+            # Find the end of the function body
+            body_end = self._find_javascript_block_end(content, match.end())
+            if body_end is None:
+                func_end = func_start
+            else:
+                func_end = func_start + content.count('\n', match.start(), body_end)
             
-            # Calculate complexity for this function
-            func_lines = lines[func_start - 1:func_end]
-            func_content = '\n'.join(func_lines)
+            # Calculate complexity over the function's lines, in place
+            func_pos = content.rfind('\n', 0, match.start()) + 1
+            func_endpos = content.find('\n', match.start() if body_end is None else body_end)
+            if func_endpos < 0:
+                func_endpos = len(content)
             
             # Count complexity indicators
             complexity = 1
-            complexity_patterns = [
-                r'\bif\b', r'\belse\s+if\b', r'\bwhile\b', r'\bfor\b',
-                r'\bdo\b', r'\bswitch\b', r'\bcase\b', r'\bcatch\b',
-                r'\?\s*[^:]+\s*:', r'&&', r'\|\|'
-            ]
-            
-            for pattern in complexity_patterns:
-                complexity += len(re.findall(pattern, func_content))
+            complexity += len(_JS_DECISION_PATTERN.findall(content, func_pos, func_endpos))
+            complexity += len(_JS_TERNARY_PATTERN.findall(content, func_pos, func_endpos))
             
             if complexity > 10:
-                issues.append(CodeIssue(
+                yield CodeIssue(
                     file=file_path,
                     line=func_start,
                     column=None,
@@ -661,11 +1519,11 @@ class CodeReviewAgent(BaseAgent):
                     message=f"High complexity ({complexity}) in function '{func_name}'",
                     suggestion="Consider refactoring to reduce complexity",
                     rule="cyclomatic-complexity"
-                ))
+                )
             
             # Check function length
             if func_end - func_start > 50:
-                issues.append(CodeIssue(
+                yield CodeIssue(
                     file=file_path,
                     line=func_start,
                     column=None,
@@ -673,57 +1531,59 @@ class CodeReviewAgent(BaseAgent):
                     category=IssueCategory.MAINTAINABILITY,
                     message=f"Function '{func_name}' is too long ({func_end - func_start} lines)",
                     suggestion="Consider splitting into smaller functions"
-                ))
-        
-        return issues
+                )
     
-    async def _analyze_typescript(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    @staticmethod
+    def _find_javascript_block_end(content: str, start: int) -> Optional[int]:
+        """
+        Find the offset of the brace closing the first block opened at or
+        after start, or None if it is never closed. Braces inside strings,
+        template literals and comments are ignored, and so are braces inside
+        parentheses before the block opens: a parameter list's defaults and
+        destructuring are not the function body.
+        """
+        depth = 0
+        parens = 0
+        for token in _JS_BRACKET_TOKEN_PATTERN.finditer(content, start):
+            bracket = token.group()
+            if not depth:
+                # Until the block opens, follow the parameter list's parentheses
+                if bracket == '(':
+                    parens += 1
+                elif bracket == ')':
+                    parens = max(parens - 1, 0)
+                elif bracket == '{' and not parens:
+                    depth = 1
+            elif bracket == '{':
+                depth += 1
+            elif bracket == '}':
+                depth -= 1
+                if not depth:
+                    return token.start()
+        return None
+    
+    def _analyze_typescript(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze TypeScript code"""
-        # Start with JavaScript analysis
-        issues = await self._analyze_javascript(file_path, content, lines)
-        
-        # Add TypeScript-specific checks
-        ts_patterns = [
-            (r'\bany\b(?!\s*\])', "Avoid using 'any' type", SeverityLevel.MEDIUM),
-            (r'@ts-ignore', "Avoid using @ts-ignore", SeverityLevel.MEDIUM),
-            (r'@ts-nocheck', "Avoid using @ts-nocheck", SeverityLevel.HIGH),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in ts_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=severity,
-                        category=IssueCategory.MAINTAINABILITY,
-                        message=message,
-                        suggestion="Use proper typing instead",
-                        code_snippet=line.strip()
-                    ))
-        
-        return issues
+        # JavaScript analysis plus TypeScript-specific checks in one pass
+        return self._analyze_js_like(file_path, content, lines, _TS_PATTERNS)
     
-    async def _analyze_vue(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_vue(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze Vue component files"""
-        issues = []
-        
         # Extract script section
-        script_match = re.search(r'<script[^>]*>(.*?)</script>', content, re.DOTALL)
+        script_match = _VUE_SCRIPT_PATTERN.search(content)
         if script_match:
             script_content = script_match.group(1)
             script_lines = script_content.splitlines()
             
             # Determine if TypeScript or JavaScript
             if 'lang="ts"' in script_match.group(0) or 'lang="typescript"' in script_match.group(0):
-                issues.extend(await self._analyze_typescript(file_path, script_content, script_lines))
+                yield from self._analyze_typescript(file_path, script_content, script_lines)
             else:
-                issues.extend(await self._analyze_javascript(file_path, script_content, script_lines))
+                yield from self._analyze_javascript(file_path, script_content, script_lines)
         
         # Vue-specific checks
-        if not re.search(r'<template>', content):
-            issues.append(CodeIssue(
+        if not _VUE_TEMPLATE_PATTERN.search(content):
+            yield CodeIssue(
                 file=file_path,
                 line=1,
                 column=None,
@@ -731,204 +1591,85 @@ class CodeReviewAgent(BaseAgent):
                 category=IssueCategory.RELIABILITY,
                 message="Missing <template> section in Vue component",
                 suggestion="Add a template section"
-            ))
-        
-        return issues
+            )
     
-    async def _analyze_go(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
-        """Analyze Go code"""
-        issues = []
-        
-        # Go-specific patterns
-        go_patterns = [
-            (r'panic\(', "Avoid using panic in production code", SeverityLevel.HIGH),
-            (r'fmt\.Print', "Use proper logging instead of fmt.Print", SeverityLevel.LOW),
-            (r'if\s+err\s*!=\s*nil\s*{\s*}', "Empty error handling", SeverityLevel.HIGH),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in go_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
+    def _match_line_patterns(self, file_path: str, lines: List[str], patterns: tuple,
+                             offset: int = 0) -> Iterator[CodeIssue]:
+        """
+        Report every line matching one of a language's line patterns. offset
+        is the number of file lines before the first of lines.
+        """
+        for index in _candidate_lines(lines, patterns):
+            line = lines[index]
+            for pattern, message, severity, category, suggestion in patterns:
+                if pattern.search(line):
+                    yield CodeIssue(
                         file=file_path,
-                        line=line_num,
+                        line=offset + index + 1,
                         column=None,
                         severity=severity,
-                        category=IssueCategory.RELIABILITY,
+                        category=category,
                         message=message,
+                        suggestion=suggestion,
                         code_snippet=line.strip()
-                    ))
-        
-        return issues
+                    )
+    
+    def _analyze_go(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
+        """Analyze Go code"""
+        return self._match_line_patterns(file_path, lines, _GO_PATTERNS)
     
-    async def _analyze_rust(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_rust(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze Rust code"""
-        issues = []
-        
-        # Rust-specific patterns
-        rust_patterns = [
-            (r'unwrap\(\)', "Avoid using unwrap() - handle errors properly", SeverityLevel.MEDIUM),
-            (r'expect\(', "Consider proper error handling instead of expect()", SeverityLevel.LOW),
-            (r'unsafe\s*{', "Unsafe code block detected", SeverityLevel.HIGH),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in rust_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=severity,
-                        category=IssueCategory.RELIABILITY if 'unsafe' not in pattern else IssueCategory.SECURITY,
-                        message=message,
-                        code_snippet=line.strip()
-                    ))
-        
-        return issues
+        return self._match_line_patterns(file_path, lines, _RUST_PATTERNS)
     
-    async def _analyze_java(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_java(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze Java code"""
-        issues = []
-        
-        # Java-specific patterns
-        java_patterns = [
-            (r'System\.out\.print', "Use proper logging instead of System.out", SeverityLevel.LOW),
-            (r'catch\s*\(\s*Exception\s+\w+\s*\)', "Avoid catching generic Exception", SeverityLevel.MEDIUM),
-            (r'@SuppressWarnings', "Avoid suppressing warnings", SeverityLevel.LOW),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in java_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=severity,
-                        category=IssueCategory.MAINTAINABILITY,
-                        message=message,
-                        code_snippet=line.strip()
-                    ))
-        
-        return issues
+        return self._match_line_patterns(file_path, lines, _JAVA_PATTERNS)
     
-    async def _analyze_cpp(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_cpp(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze C++ code"""
-        issues = []
-        
-        # C++ specific patterns
-        cpp_patterns = [
-            (r'\bnew\s+', "Consider using smart pointers instead of raw new", SeverityLevel.MEDIUM),
-            (r'using\s+namespace\s+std;', "Avoid 'using namespace std' in headers", SeverityLevel.MEDIUM),
-            (r'#define\s+', "Consider using const or constexpr instead of #define", SeverityLevel.LOW),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in cpp_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=severity,
-                        category=IssueCategory.MAINTAINABILITY,
-                        message=message,
-                        code_snippet=line.strip()
-                    ))
-        
-        return issues
+        return self._match_line_patterns(file_path, lines, _CPP_PATTERNS)
     
-    async def _analyze_c(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_c(self, file_path: str, content: str, lines: List[str]) -> Iterator[CodeIssue]:
         """Analyze C code"""
-        issues = []
-        
-        # C specific patterns
-        c_patterns = [
-            (r'gets\(', "Never use gets() - use fgets() instead", SeverityLevel.CRITICAL),
-            (r'strcpy\(', "Consider using strncpy() instead of strcpy()", SeverityLevel.HIGH),
-            (r'malloc\(.*\)\s*;(?!.*free\()', "Potential memory leak - missing free()", SeverityLevel.HIGH),
-        ]
-        
-        for line_num, line in enumerate(lines, 1):
-            for pattern, message, severity in c_patterns:
-                if re.search(pattern, line):
-                    issues.append(CodeIssue(
-                        file=file_path,
-                        line=line_num,
-                        column=None,
-                        severity=severity,
-                        category=IssueCategory.SECURITY if severity == SeverityLevel.CRITICAL else IssueCategory.RELIABILITY,
-                        message=message,
-                        code_snippet=line.strip()
-                    ))
-        
-        return issues
+        return self._match_line_patterns(file_path, lines, _C_PATTERNS)
     
-    def _analyze_generic(self, file_path: str, content: str, lines: List[str]) -> List[CodeIssue]:
+    def _analyze_generic(self, file_path: str, content: str, lines: List[str]) -> Iterable[CodeIssue]:
         """Generic analysis for unsupported file types"""
-        issues = []
-        
         # Just do basic checks already done in _check_common_issues
         # Additional generic checks could go here
-        
-        return issues
+        return ()
     
     def calculate_metrics(self, content: str, lines: List[str]) -> CodeMetrics:
         """Calculate code metrics"""
         metrics = CodeMetrics()
         
         # Count lines
-        metrics.lines_of_code = len(lines)
-        metrics.blank_lines = sum(1 for line in lines if not line.strip())
-        metrics.comment_lines = sum(1 for line in lines if line.strip().startswith(('#', '//', '/*', '*')))
+        _count_lines(metrics, lines)
         
         # Try to parse as Python for detailed metrics
         try:
-            tree = ast.parse(content)
+            tree = _parse_python(content)
             
-            # Count functions and classes
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    metrics.functions += 1
-                    
-                    # Calculate complexity for each function
-                    func_complexity = self.complexity_analyzer.calculate_cyclomatic_complexity(node)
-                    metrics.cyclomatic_complexity += func_complexity
-                    
-                    func_cognitive = self.complexity_analyzer.calculate_cognitive_complexity(node)
-                    metrics.cognitive_complexity += func_cognitive
-                    
-                    # Calculate Halstead metrics
-                    halstead = self.complexity_analyzer.calculate_halstead_metrics(node)
-                    metrics.halstead_volume += halstead['volume']
-                    metrics.halstead_difficulty += halstead['difficulty']
-                    metrics.halstead_effort += halstead['effort']
-                    
-                elif isinstance(node, ast.ClassDef):
-                    metrics.classes += 1
+            # Function, class, complexity and Halstead metrics in a single traversal
+            visitor = PythonMetricsVisitor()
+            visitor.visit(tree)
             
-            # Calculate max nesting depth
-            metrics.max_nesting_depth = self.complexity_analyzer.calculate_nesting_depth(tree)
+            metrics.functions = visitor.functions
+            metrics.classes = visitor.classes
+            metrics.cyclomatic_complexity = visitor.cyclomatic_complexity
+            metrics.cognitive_complexity = visitor.cognitive_complexity
+            metrics.halstead_volume = visitor.halstead_volume
+            metrics.halstead_difficulty = visitor.halstead_difficulty
+            metrics.halstead_effort = visitor.halstead_effort
+            metrics.max_nesting_depth = visitor.max_nesting_depth
             
         except:
             # For non-Python files, use simpler heuristics
-            # Count complexity keywords
-            complexity_keywords = ['if', 'elif', 'else', 'for', 'while', 'except', 'catch', 'case', 'default']
-            for line in lines:
-                for keyword in complexity_keywords:
-                    if re.search(r'\b' + keyword + r'\b', line):
-                        metrics.cyclomatic_complexity += 1
+            metrics.cyclomatic_complexity = _keyword_complexity(lines)
         
         # Calculate maintainability index
-        # MI = 171 - 5.2 * ln(V) - 0.23 * G - 16.2 * ln(L)
-        if metrics.lines_of_code > 0:
-            # Use Halstead volume if available, otherwise estimate
-            volume = metrics.halstead_volume if metrics.halstead_volume > 0 else metrics.lines_of_code * 2
-            metrics.maintainability_index = max(0, min(100, 
-                171 - 5.2 * math.log(max(1, volume)) 
-                - 0.23 * metrics.cyclomatic_complexity 
-                - 16.2 * math.log(max(1, metrics.lines_of_code))))
+        _set_maintainability_index(metrics)
         
         return metrics
     
@@ -937,52 +1678,28 @@ class CodeReviewAgent(BaseAgent):
         score = 100.0
         
         # Deduct points based on issue severity
-        severity_penalties = {
-            SeverityLevel.CRITICAL: 20,
-            SeverityLevel.HIGH: 10,
-            SeverityLevel.MEDIUM: 5,
-            SeverityLevel.LOW: 2,
-            SeverityLevel.INFO: 0
-        }
-        
-        for issue in issues:
-            score -= severity_penalties[issue.severity]
-        
-        # Factor in complexity
-        if metrics.cyclomatic_complexity > 30:
-            score -= 15
-        elif metrics.cyclomatic_complexity > 20:
-            score -= 10
-        elif metrics.cyclomatic_complexity > 10:
-            score -= 5
-        
-        # Factor in cognitive complexity
-        if metrics.cognitive_complexity > 40:
-            score -= 15
-        elif metrics.cognitive_complexity > 25:
-            score -= 10
-        elif metrics.cognitive_complexity > 15:
-            score -= 5
-        
-        # Factor in maintainability
-        if metrics.maintainability_index < 30:
-            score -= 15
-        elif metrics.maintainability_index < 50:
-            score -= 10
-        elif metrics.maintainability_index < 70:
-            score -= 5
-        
-        # Factor in nesting depth
-        if metrics.max_nesting_depth > 6:
-            score -= 10
-        elif metrics.max_nesting_depth > 4:
-            score -= 5
+        score -= sum(_SEVERITY_PENALTIES[issue.severity] for issue in issues)
+        
+        # Factor in complexity, cognitive complexity, maintainability and nesting depth
+        complexity = metrics.cyclomatic_complexity
+        score -= next((penalty for threshold, penalty in _CYCLOMATIC_PENALTIES if complexity > threshold), 0)
+        cognitive = metrics.cognitive_complexity
+        score -= next((penalty for threshold, penalty in _COGNITIVE_PENALTIES if cognitive > threshold), 0)
+        maintainability = metrics.maintainability_index
+        score -= next((penalty for threshold, penalty in _MAINTAINABILITY_PENALTIES if maintainability < threshold), 0)
+        depth = metrics.max_nesting_depth
+        score -= next((penalty for threshold, penalty in _NESTING_PENALTIES if depth > threshold), 0)
         
         # Ensure score is within bounds
         return max(0, min(100, score))
     
-    async def review_project(self, project_path: str, file_patterns: Optional[List[str]] = None) -> ReviewResult:
-        """Review an entire project"""
+    async def review_project(
+        self,
+        project_path: str,
+        file_patterns: Optional[List[str]] = None,
+        use_cache: bool = True
+    ) -> ReviewResult:
+        """Review an entire project, reusing cached results for unchanged files"""
         logger.info(f"Reviewing project: {project_path}")
         
         # Default file patterns
@@ -991,52 +1708,76 @@ class CodeReviewAgent(BaseAgent):
                            '*.go', '*.rs', '*.java', '*.cpp', '*.c']
         
         all_issues = []
+        severity_counts = Counter()
         total_metrics = CodeMetrics()
+        maintainability_total = 0.0
         files_reviewed = 0
         
-        # Find all matching files
-        for pattern in file_patterns:
-            for file_path in Path(project_path).rglob(pattern):
-                # Skip common directories to ignore
-                if any(skip in str(file_path) for skip in ['node_modules', '__pycache__', '.git', 'dist', 'build']):
-                    continue
-                
-                # Review the file
-                issues = await self.review_file(str(file_path))
-                all_issues.extend(issues)
-                
-                # Calculate metrics
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        lines = content.splitlines()
-                        file_metrics = self.calculate_metrics(content, lines)
-                        
-                        # Aggregate metrics
-                        total_metrics.lines_of_code += file_metrics.lines_of_code
-                        total_metrics.comment_lines += file_metrics.comment_lines
-                        total_metrics.blank_lines += file_metrics.blank_lines
-                        total_metrics.cyclomatic_complexity += file_metrics.cyclomatic_complexity
-                        total_metrics.cognitive_complexity += file_metrics.cognitive_complexity
-                        total_metrics.functions += file_metrics.functions
-                        total_metrics.classes += file_metrics.classes
-                        total_metrics.code_smells += len([i for i in issues if i.severity in [SeverityLevel.MEDIUM, SeverityLevel.LOW]])
-                        total_metrics.max_nesting_depth = max(total_metrics.max_nesting_depth, file_metrics.max_nesting_depth)
-                        
-                        files_reviewed += 1
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
+        # Find all matching files, skipping common directories to ignore
+        file_paths = _find_source_files(project_path, file_patterns)
+        
+        cache = None
+        if use_cache:
+            try:
+                cache = ReviewCache(project_path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Review cache unavailable for {project_path}: {e}")
+        
+        try:
+            # Files unchanged since a previous review are not reviewed again
+            results = [cache.get(file_path) if cache else None for file_path in file_paths]
+            stale = [index for index, result in enumerate(results) if result is None]
+            stale_paths = [file_paths[index] for index in stale]
+            fingerprints = [cache.fingerprint(file_path) for file_path in stale_paths] if cache else []
+            
+            # Review and measure the files in parallel worker processes
+            if len(stale_paths) < 2:
+                reviewed = [await self._review_and_measure(file_path) for file_path in stale_paths]
+            else:
+                reviewed = await self._run_in_workers(_review_and_measure_worker, stale_paths)
+            
+            for index, result in zip(stale, reviewed):
+                results[index] = result
+            
+            if cache:
+                for file_path, fingerprint, (issues, file_metrics) in zip(stale_paths, fingerprints, reviewed):
+                    if fingerprint is not None and file_metrics is not None:
+                        cache.put(file_path, fingerprint, issues, file_metrics)
+        finally:
+            if cache:
+                cache.close()
+        
+        for issues, file_metrics in results:
+            all_issues.extend(issues)
+            file_severity_counts = Counter(issue.severity for issue in issues)
+            severity_counts.update(file_severity_counts)
+            if file_metrics is None:
+                continue
+            
+            # Aggregate metrics
+            total_metrics.lines_of_code += file_metrics.lines_of_code
+            total_metrics.comment_lines += file_metrics.comment_lines
+            total_metrics.blank_lines += file_metrics.blank_lines
+            total_metrics.cyclomatic_complexity += file_metrics.cyclomatic_complexity
+            total_metrics.cognitive_complexity += file_metrics.cognitive_complexity
+            total_metrics.functions += file_metrics.functions
+            total_metrics.classes += file_metrics.classes
+            total_metrics.code_smells += sum(file_severity_counts[severity] for severity in _CODE_SMELL_SEVERITIES)
+            total_metrics.max_nesting_depth = max(total_metrics.max_nesting_depth, file_metrics.max_nesting_depth)
+            maintainability_total += file_metrics.maintainability_index
+            
+            files_reviewed += 1
         
         # Calculate average maintainability index
         if files_reviewed > 0:
-            total_metrics.maintainability_index = self.calculate_metrics("", []).maintainability_index
+            total_metrics.maintainability_index = maintainability_total / files_reviewed
         
         # Calculate overall score
         score = self.calculate_review_score(all_issues, total_metrics)
         
         # Generate summary
-        critical_issues = len([i for i in all_issues if i.severity == SeverityLevel.CRITICAL])
-        high_issues = len([i for i in all_issues if i.severity == SeverityLevel.HIGH])
+        critical_issues = severity_counts[SeverityLevel.CRITICAL]
+        high_issues = severity_counts[SeverityLevel.HIGH]
         
         summary = f"Reviewed {files_reviewed} files. Found {len(all_issues)} issues: "
         summary += f"{critical_issues} critical, {high_issues} high priority. "
@@ -1070,6 +1811,20 @@ class CodeReviewAgent(BaseAgent):
             passed=passed
         )
     
+    async def execute(self, input_data: Any, context: AgentContext) -> Dict[str, Any]:
+        """Execute a code review based on input"""
+        # Parse input
+        if isinstance(input_data, str):
+            try:
+                task = json.loads(input_data)
+            except json.JSONDecodeError:
+                task = {"action": "review_file", "file_path": input_data}
+        else:
+            task = input_data
+        
+        context.current_task = task
+        return await self.process(context)
+    
     async def process(self, context: AgentContext) -> Dict[str, Any]:
         """Process a code review request"""
         self.context = context
@@ -1083,13 +1838,10 @@ class CodeReviewAgent(BaseAgent):
             
             if task.get("action") == "review_file":
                 file_path = task.get("file_path")
-                issues = await self.review_file(file_path)
-                
-                # Calculate metrics
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                    lines = content.splitlines()
-                    metrics = self.calculate_metrics(content, lines)
+                # Large files are reviewed and measured in one streamed pass
+                issues, metrics = await self._review_and_measure(file_path)
+                if metrics is None:
+                    raise ValueError(f"Could not review file: {file_path}")
                 
                 score = self.calculate_review_score(issues, metrics)
                 
@@ -1118,14 +1870,16 @@ class CodeReviewAgent(BaseAgent):
             elif task.get("action") == "review_project":
                 project_path = task.get("project_path")
                 file_patterns = task.get("file_patterns")
+                use_cache = task.get("use_cache", True)
                 
-                review_result = await self.review_project(project_path, file_patterns)
+                review_result = await self.review_project(project_path, file_patterns, use_cache)
+                severity_counts = Counter(issue.severity for issue in review_result.issues)
                 
                 result.update({
                     "files_reviewed": review_result.files_reviewed,
                     "total_issues": len(review_result.issues),
-                    "critical_issues": len([i for i in review_result.issues if i.severity == SeverityLevel.CRITICAL]),
-                    "high_issues": len([i for i in review_result.issues if i.severity == SeverityLevel.HIGH]),
+                    "critical_issues": severity_counts[SeverityLevel.CRITICAL],
+                    "high_issues": severity_counts[SeverityLevel.HIGH],
                     "metrics": {
                         "total_lines": review_result.metrics.lines_of_code,
                         "comment_lines": review_result.metrics.comment_lines,
@@ -1153,4 +1907,26 @@ class CodeReviewAgent(BaseAgent):
             result["status"] = "error"
             result["error"] = str(e)
         
-        return result
\ No newline at end of file
+        return result
+
+
+# Reviewer reused by every task a pool worker process handles
+_worker_agent: Optional[CodeReviewAgent] = None
+
+
+def _get_worker_agent() -> CodeReviewAgent:
+    """Create this worker process's reviewer on first use"""
+    global _worker_agent
+    if _worker_agent is None:
+        _worker_agent = CodeReviewAgent(Config())
+    return _worker_agent
+
+
+def _review_file_worker(file_path: str) -> List[CodeIssue]:
+    """Review one file inside a worker process (module-level so it pickles)"""
+    return asyncio.run(_get_worker_agent().review_file(file_path))
+
+
+def _review_and_measure_worker(file_path: str) -> Tuple[List[CodeIssue], Optional[CodeMetrics]]:
+    """Review and measure one file inside a worker process"""
+    return asyncio.run(_get_worker_agent()._review_and_measure(file_path))
\ No newline at end of file
@@ -4,14 +4,16 @@ Enables agents to collaborate, share context, and coordinate tasks
 """
 
 import asyncio
+import itertools
 import json
 import logging
+import os
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import uuid
-from collections import deque
 
 logger = logging.getLogger(__name__)
 
@@ -38,20 +40,63 @@ class MessagePriority(Enum):
     CRITICAL = 3
 
 
-@dataclass
+# Message ids are a random per-process prefix plus a sequence number:
+# unique like a uuid4, without reading urandom for every message
+_message_id_prefix = uuid.uuid4().hex[:12]
+_message_ids = itertools.count()
+
+
+def _new_message_id() -> str:
+    """Generate a unique message id"""
+    return f"{_message_id_prefix}-{next(_message_ids)}"
+
+
+def _reset_message_ids():
+    """Give a forked child process its own id prefix"""
+    global _message_id_prefix, _message_ids
+    _message_id_prefix = uuid.uuid4().hex[:12]
+    _message_ids = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_message_ids)
+
+
+def _parse_timestamp(value: str) -> float:
+    """Seconds since the epoch for an ISO 8601 timestamp, naive ones being UTC"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@dataclass(slots=True)
 class Message:
     """Message exchanged between agents"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_message_id)
     type: MessageType = MessageType.REQUEST
     sender: str = ""
     recipient: str = ""  # Empty for broadcasts
     priority: MessagePriority = MessagePriority.NORMAL
     payload: Dict[str, Any] = field(default_factory=dict)
     context: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: float = field(default_factory=time.time)  # Seconds since the epoch
     requires_response: bool = False
     correlation_id: Optional[str] = None  # Links related messages
     ttl: Optional[int] = None  # Time to live in seconds
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """The timestamp as naive UTC ISO 8601, formatted once per message"""
+        if self._timestamp_iso is None:
+            created = datetime.fromtimestamp(self.timestamp, timezone.utc)
+            self._timestamp_iso = created.replace(tzinfo=None).isoformat()
+        return self._timestamp_iso
+    
+    def is_expired(self) -> bool:
+        """Whether the message has outlived its time to live"""
+        return self.ttl is not None and time.time() - self.timestamp > self.ttl
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary"""
@@ -63,7 +108,7 @@ class Message:
             "priority": self.priority.value,
             "payload": self.payload,
             "context": self.context,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.timestamp_iso,
             "requires_response": self.requires_response,
             "correlation_id": self.correlation_id,
             "ttl": self.ttl
@@ -72,27 +117,30 @@ class Message:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Message":
         """Create message from dictionary"""
-        return cls(
-            id=data.get("id", str(uuid.uuid4())),
+        message = cls(
+            id=data["id"] if "id" in data else _new_message_id(),
             type=MessageType(data.get("type", "request")),
             sender=data.get("sender", ""),
             recipient=data.get("recipient", ""),
             priority=MessagePriority(data.get("priority", 1)),
             payload=data.get("payload", {}),
             context=data.get("context", {}),
-            timestamp=datetime.fromisoformat(data["timestamp"]) if "timestamp" in data else datetime.utcnow(),
+            timestamp=_parse_timestamp(data["timestamp"]) if "timestamp" in data else time.time(),
             requires_response=data.get("requires_response", False),
             correlation_id=data.get("correlation_id"),
             ttl=data.get("ttl")
         )
+        if "timestamp" in data:
+            message._timestamp_iso = data["timestamp"]
+        return message
 
 
 class MessageBus:
     """Central message bus for agent communication"""
     
     def __init__(self, max_queue_size: int = 1000):
-        self.subscribers: Dict[str, List[Callable]] = {}
-        self.message_queue: deque = deque(maxlen=max_queue_size)
+        self.subscribers: Dict[str, List[Tuple[Callable, bool]]] = {}  # (callback, is coroutine function)
+        self.message_queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
         self.pending_responses: Dict[str, asyncio.Future] = {}
         self.agent_channels: Dict[str, asyncio.Queue] = {}
         self.running = False
@@ -105,21 +153,27 @@ class MessageBus:
         logger.info("Message bus started")
         
     async def stop(self):
-        """Stop the message bus"""
+        """Stop the message bus once the messages already queued are routed"""
         self.running = False
         if self.processing_task:
+            await self.message_queue.put(None)  # Wakes the processor to stop
             await self.processing_task
+            self.processing_task = None
         logger.info("Message bus stopped")
         
     def register_agent(self, agent_id: str, callback: Optional[Callable] = None):
-        """Register an agent with the message bus"""
+        """
+        Register an agent with the message bus. A coroutine function callback
+        runs as its own task for each message; a plain function is called
+        during delivery and must not block.
+        """
         if agent_id not in self.agent_channels:
             self.agent_channels[agent_id] = asyncio.Queue(maxsize=100)
         
         if callback:
             if agent_id not in self.subscribers:
                 self.subscribers[agent_id] = []
-            self.subscribers[agent_id].append(callback)
+            self.subscribers[agent_id].append((callback, asyncio.iscoroutinefunction(callback)))
         
         logger.info(f"Registered agent: {agent_id}")
         
@@ -137,21 +191,38 @@ class MessageBus:
         if not message.sender:
             raise ValueError("Message must have a sender")
         
-        # Add to queue
-        self.message_queue.append(message)
+        if message.is_expired():
+            logger.warning(f"Message {message.id} expired before it was sent")
+            return None
         
-        # If requires response, wait for it
+        broadcast = not message.recipient or message.type == MessageType.BROADCAST
+        if broadcast and not self.running:
+            # Nothing routes the queue, so waiting for room would never end
+            logger.warning(f"Message bus is not running; broadcast {message.id} dropped")
+            return None
+        
+        # Registered before delivery so the recipient can always respond
         if message.requires_response:
-            future = asyncio.Future()
+            future = asyncio.get_running_loop().create_future()
             self.pending_responses[message.id] = future
-            
+        
+        if not broadcast:
+            # Direct messages are delivered right away
+            await self._deliver_to_agent(message.recipient, message)
+        else:
+            # Broadcasts go through the queue, waiting for room if the bus is backed up
+            await self.message_queue.put(message)
+        
+        # If requires response, wait for it
+        if message.requires_response:
             try:
-                response = await asyncio.wait_for(future, timeout=30.0)
-                return response
+                return await asyncio.wait_for(future, timeout=30.0)
             except asyncio.TimeoutError:
                 logger.error(f"Timeout waiting for response to message {message.id}")
-                del self.pending_responses[message.id]
                 return None
+            finally:
+                # Also reached when the sender is cancelled while waiting
+                self.pending_responses.pop(message.id, None)
         
         return None
         
@@ -161,43 +232,66 @@ class MessageBus:
         await self.send_message(message)
         
     async def _process_messages(self):
-        """Process messages from the queue"""
-        while self.running:
+        """Process messages from the queue as soon as they arrive"""
+        get = self.message_queue.get
+        route = self._route_message
+        while True:
+            message = await get()
+            if message is None:  # Sentinel from stop()
+                break
             try:
-                if self.message_queue:
-                    message = self.message_queue.popleft()
-                    await self._route_message(message)
-                else:
-                    await asyncio.sleep(0.01)  # Small delay when queue is empty
+                await route(message)
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
                 
     async def _route_message(self, message: Message):
         """Route a message to its recipient(s)"""
+        # Messages that expired while queued are not delivered
+        if self._drop_if_expired(message):
+            return
+        
         # Handle broadcast
         if not message.recipient or message.type == MessageType.BROADCAST:
-            for agent_id in self.agent_channels.keys():
-                if agent_id != message.sender:  # Don't send to self
-                    await self._deliver_to_agent(agent_id, message)
+            # Putting into a channel with room never suspends, so those are
+            # delivered in turn; full channels wait together rather than
+            # holding up every agent after them
+            blocked = []
+            sender = message.sender
+            deliver = self._deliver_to_agent
+            for agent_id, queue in list(self.agent_channels.items()):
+                if agent_id == sender:  # Don't send to self
+                    continue
+                if queue.full():
+                    blocked.append(deliver(agent_id, message))
+                else:
+                    await deliver(agent_id, message)
+            if blocked:
+                await asyncio.gather(*blocked)
         else:
             # Direct message
             await self._deliver_to_agent(message.recipient, message)
             
     async def _deliver_to_agent(self, agent_id: str, message: Message):
         """Deliver a message to a specific agent"""
-        if agent_id not in self.agent_channels:
+        queue = self.agent_channels.get(agent_id)
+        if queue is None:
             logger.warning(f"Agent {agent_id} not registered")
             return
             
         try:
             # Put message in agent's queue
-            queue = self.agent_channels[agent_id]
             await queue.put(message)
             
             # Call callbacks if any
-            if agent_id in self.subscribers:
-                for callback in self.subscribers[agent_id]:
-                    asyncio.create_task(callback(message))
+            subscribers = self.subscribers.get(agent_id)
+            if subscribers:
+                for callback, is_async in subscribers:
+                    if is_async:
+                        asyncio.create_task(callback(message))
+                    else:
+                        result = callback(message)
+                        if asyncio.iscoroutine(result):  # e.g. a lambda wrapping a coroutine function
+                            asyncio.create_task(result)
                     
         except asyncio.QueueFull:
             logger.error(f"Queue full for agent {agent_id}, dropping message")
@@ -205,29 +299,54 @@ class MessageBus:
             logger.error(f"Error delivering message to {agent_id}: {e}")
             
     async def get_messages(self, agent_id: str, timeout: Optional[float] = None) -> List[Message]:
-        """Get pending messages for an agent"""
+        """
+        Get pending messages for an agent. With a timeout, waits up to that
+        long for a first message when none is pending.
+        """
         if agent_id not in self.agent_channels:
             return []
             
         messages = []
         queue = self.agent_channels[agent_id]
         
-        try:
-            # Get all available messages
-            while not queue.empty():
-                message = await asyncio.wait_for(queue.get(), timeout=timeout or 0.1)
+        if timeout and queue.empty():
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return messages
+            if not self._drop_if_expired(message):
+                messages.append(message)
+        
+        # Get all available messages
+        while True:
+            try:
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if not self._drop_if_expired(message):
                 messages.append(message)
-        except asyncio.TimeoutError:
-            pass
             
         return messages
         
+    def _drop_if_expired(self, message: Message) -> bool:
+        """
+        Whether a message has expired and should be dropped. A sender waiting
+        for a response to it gets None straight away instead of timing out.
+        """
+        if not message.is_expired():
+            return False
+        
+        logger.debug(f"Dropping expired message {message.id}")
+        future = self.pending_responses.pop(message.id, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+        return True
+    
     def send_response(self, original_message_id: str, response: Message):
         """Send a response to a message that required one"""
-        if original_message_id in self.pending_responses:
-            future = self.pending_responses[original_message_id]
+        future = self.pending_responses.pop(original_message_id, None)
+        if future is not None and not future.done():
             future.set_result(response)
-            del self.pending_responses[original_message_id]
 
 
 class AgentProtocol:
@@ -237,6 +356,8 @@ class AgentProtocol:
         self.agent_id = agent_id
         self.message_bus = message_bus
         self.message_handlers: Dict[MessageType, Callable] = {}
+        self.batch_windows: Dict[MessageType, float] = {}  # Seconds to collect a batch for
+        self._batches: Dict[MessageType, List[Message]] = {}
         
         # Register with message bus
         self.message_bus.register_agent(agent_id, self._handle_message)
@@ -301,12 +422,36 @@ class AgentProtocol:
         
         return response is not None and response.payload.get("accepted", False)
         
-    def register_handler(self, message_type: MessageType, handler: Callable):
-        """Register a handler for a specific message type"""
+    def register_handler(self, message_type: MessageType, handler: Callable,
+                         batch: bool = False, window_ms: float = 2.0):
+        """
+        Register a handler for a specific message type. A batch handler is
+        called once with the list of messages of that type arriving within
+        window_ms of the first, instead of once per message.
+        """
         self.message_handlers[message_type] = handler
+        if batch:
+            self.batch_windows[message_type] = window_ms / 1000
+        else:
+            self.batch_windows.pop(message_type, None)
         
     async def _handle_message(self, message: Message):
         """Handle an incoming message"""
+        window = self.batch_windows.get(message.type)
+        if window is not None:
+            batch = self._batches.get(message.type)
+            if batch is not None:
+                batch.append(message)  # Handled by the task that started the batch
+                return
+            self._batches[message.type] = [message]
+            try:
+                await asyncio.sleep(window)
+            finally:
+                # Closed and dispatched even if cancelled while collecting,
+                # so later messages never join a batch that will not run
+                await self._handle_batch(message.type, self._batches.pop(message.type))
+            return
+        
         if message.type in self.message_handlers:
             handler = self.message_handlers[message.type]
             try:
@@ -314,31 +459,48 @@ class AgentProtocol:
                 
                 # Send response if required
                 if message.requires_response:
-                    response = Message(
-                        type=MessageType.RESPONSE if message.type == MessageType.REQUEST else MessageType.RESULT,
-                        sender=self.agent_id,
-                        recipient=message.sender,
-                        payload=result if result else {"status": "ok"},
-                        correlation_id=message.id
+                    self._respond(
+                        message,
+                        MessageType.RESPONSE if message.type == MessageType.REQUEST else MessageType.RESULT,
+                        result if result else {"status": "ok"}
                     )
-                    self.message_bus.send_response(message.id, response)
                     
             except Exception as e:
                 logger.error(f"Error handling message {message.id}: {e}")
                 
                 # Send error response if required
                 if message.requires_response:
-                    response = Message(
-                        type=MessageType.RESPONSE,
-                        sender=self.agent_id,
-                        recipient=message.sender,
-                        payload={"error": str(e)},
-                        correlation_id=message.id
-                    )
-                    self.message_bus.send_response(message.id, response)
+                    self._respond(message, MessageType.RESPONSE, {"error": str(e)})
         else:
             logger.debug(f"No handler for message type {message.type} in agent {self.agent_id}")
             
+    async def _handle_batch(self, message_type: MessageType, messages: List[Message]):
+        """Handle a batch of messages of one type with a single handler call"""
+        try:
+            await self.message_handlers[message_type](messages)
+            response_type = MessageType.RESPONSE if message_type == MessageType.REQUEST else MessageType.RESULT
+            payload = {"status": "ok"}
+        except Exception as e:
+            logger.error(f"Error handling batch of {len(messages)} {message_type.value} messages: {e}")
+            response_type = MessageType.RESPONSE
+            payload = {"error": str(e)}
+        
+        # Every message in the batch that requires a response gets the same one
+        for message in messages:
+            if message.requires_response:
+                self._respond(message, response_type, payload)
+            
+    def _respond(self, message: Message, response_type: MessageType, payload: Dict[str, Any]):
+        """Send the response to a message that required one"""
+        response = Message(
+            type=response_type,
+            sender=self.agent_id,
+            recipient=message.sender,
+            payload=payload,
+            correlation_id=message.id
+        )
+        self.message_bus.send_response(message.id, response)
+            
     async def get_pending_messages(self) -> List[Message]:
         """Get all pending messages for this agent"""
         return await self.message_bus.get_messages(self.agent_id)
@@ -347,16 +509,33 @@ class AgentProtocol:
 class CollaborationCoordinator:
     """Coordinates collaboration between multiple agents"""
     
-    def __init__(self, message_bus: MessageBus):
+    def __init__(self, message_bus: MessageBus, collaboration_ttl: float = 3600.0):
         self.message_bus = message_bus
+        self.collaboration_ttl = collaboration_ttl  # Seconds before an unended collaboration is forgotten
         self.active_collaborations: Dict[str, Dict[str, Any]] = {}
         
+    def _expire_collaborations(self):
+        """Forget collaborations that were started too long ago and never ended"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.collaboration_ttl)
+        collaborations = self.active_collaborations
+        # Kept in start order, so the expired ones are at the front
+        while collaborations:
+            collaboration_id = next(iter(collaborations))
+            if collaborations[collaboration_id]["started_at"] > cutoff:
+                break
+            del collaborations[collaboration_id]
+            logger.warning(f"Collaboration {collaboration_id} expired without being ended")
+        
     async def initiate_collaboration(self, collaboration_id: str, 
                                     participants: List[str],
                                     objective: str,
                                     context: Dict[str, Any]) -> bool:
         """Initiate a collaboration between agents"""
+        self._expire_collaborations()
+        # Re-inserted so that a restarted collaboration moves to the back
+        self.active_collaborations.pop(collaboration_id, None)
         self.active_collaborations[collaboration_id] = {
+            "id": collaboration_id,
             "participants": participants,
             "objective": objective,
             "context": context,
@@ -364,9 +543,9 @@ class CollaborationCoordinator:
             "started_at": datetime.utcnow()
         }
         
-        # Notify all participants
-        for agent_id in participants:
-            message = Message(
+        # Notify all participants; one with a full channel does not hold up the rest
+        await asyncio.gather(*(
+            self.message_bus.send_message(Message(
                 type=MessageType.EVENT,
                 sender="collaboration_coordinator",
                 recipient=agent_id,
@@ -378,8 +557,9 @@ class CollaborationCoordinator:
                     "context": context
                 },
                 priority=MessagePriority.HIGH
-            )
-            await self.message_bus.send_message(message)
+            ))
+            for agent_id in participants
+        ))
             
         logger.info(f"Initiated collaboration {collaboration_id} with {len(participants)} participants")
         return True
@@ -394,9 +574,9 @@ class CollaborationCoordinator:
         collaboration["ended_at"] = datetime.utcnow()
         collaboration["result"] = result
         
-        # Notify all participants
-        for agent_id in collaboration["participants"]:
-            message = Message(
+        # Notify all participants; one with a full channel does not hold up the rest
+        await asyncio.gather(*(
+            self.message_bus.send_message(Message(
                 type=MessageType.EVENT,
                 sender="collaboration_coordinator",
                 recipient=agent_id,
@@ -406,8 +586,9 @@ class CollaborationCoordinator:
                     "result": result
                 },
                 priority=MessagePriority.NORMAL
-            )
-            await self.message_bus.send_message(message)
+            ))
+            for agent_id in collaboration["participants"]
+        ))
             
         del self.active_collaborations[collaboration_id]
         logger.info(f"Ended collaboration {collaboration_id}")
@@ -415,11 +596,8 @@ class CollaborationCoordinator:
         
     def get_active_collaborations(self) -> List[Dict[str, Any]]:
         """Get all active collaborations"""
+        self._expire_collaborations()
         return [
-            {
-                "id": collab_id,
-                **collab_data
-            }
-            for collab_id, collab_data in self.active_collaborations.items()
+            dict(collab_data) for collab_data in self.active_collaborations.values()
             if collab_data["status"] == "active"
         ]
\ No newline at end of file
@@ -3,9 +3,11 @@ Execution limiter for agents to prevent memory leaks and resource exhaustion
 """
 
 import asyncio
+import os
+import sys
 import time
-import tracemalloc
-from typing import Dict, Optional, Any, Callable
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Any, Callable
 from datetime import datetime, timedelta
 import logging
 from collections import deque
@@ -13,6 +15,43 @@ import gc
 
 logger = logging.getLogger(__name__)
 
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _resident_memory_mb() -> float:
+    """
+    Resident set size of this process in MB, read without instrumenting
+    allocations. Only Linux reports the current size. Elsewhere this is the
+    peak size, which an execution rarely raises, so the memory limit is
+    effectively not enforced there; where not even the peak is available
+    (Windows) it is 0.
+    """
+    try:
+        # Linux: the second field is the number of resident pages
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024 / 1024
+    except OSError:
+        pass
+    
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    # Only the peak is available: bytes on macOS, KB otherwise
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass(slots=True)
+class ExecutionRecord:
+    """Outcome of one limited execution"""
+    execution_id: str
+    timestamp: str
+    success: bool
+    duration: float
+    memory_used: float = 0
+    error: Optional[str] = None
+
 
 class ExecutionLimiter:
     """Limits agent execution resources and prevents memory leaks"""
@@ -20,7 +59,7 @@ class ExecutionLimiter:
     def __init__(
         self,
         max_execution_time: float = 30.0,  # Maximum execution time in seconds
-        max_memory_mb: int = 512,  # Maximum memory usage in MB
+        max_memory_mb: int = 512,  # Maximum memory usage in MB (enforced on Linux only)
         max_concurrent_executions: int = 10,  # Max concurrent executions
         history_size: int = 100,  # Max history entries to keep
         cleanup_interval: int = 300  # Cleanup interval in seconds
@@ -32,13 +71,15 @@ class ExecutionLimiter:
         self.cleanup_interval = cleanup_interval
         
         # Tracking structures
-        self.execution_history: deque = deque(maxlen=history_size)
+        self.execution_history: Deque[ExecutionRecord] = deque(maxlen=history_size)
         self.active_executions: Dict[str, Dict[str, Any]] = {}
         self.semaphore = asyncio.Semaphore(max_concurrent_executions)
-        self.last_cleanup = time.time()
+        self.last_cleanup = time.monotonic()
         
-        # Start memory tracking
-        tracemalloc.start()
+        # Running totals over execution_history, kept in step with it
+        self._successes = 0
+        self._duration_sum = 0.0
+        self._memory_sum = 0.0
     
     async def execute_with_limits(
         self,
@@ -55,7 +96,7 @@ class ExecutionLimiter:
         # Acquire semaphore for concurrency limiting
         async with self.semaphore:
             # Track execution start
-            start_time = time.time()
+            start_time = time.monotonic()
             start_memory = self._get_memory_usage()
             
             self.active_executions[execution_id] = {
@@ -87,7 +128,7 @@ class ExecutionLimiter:
                 self._record_execution(
                     execution_id,
                     success=True,
-                    duration=time.time() - start_time,
+                    duration=time.monotonic() - start_time,
                     memory_used=memory_increase
                 )
                 
@@ -106,7 +147,7 @@ class ExecutionLimiter:
                 raise TimeoutError(f"Execution exceeded {self.max_execution_time}s limit")
                 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 logger.error(f"Execution {execution_id} failed: {str(e)}")
                 self._record_execution(
                     execution_id,
@@ -123,8 +164,7 @@ class ExecutionLimiter:
     
     def _get_memory_usage(self) -> float:
         """Get current memory usage in MB"""
-        current, peak = tracemalloc.get_traced_memory()
-        return current / 1024 / 1024  # Convert to MB
+        return _resident_memory_mb()
     
     def _record_execution(
         self,
@@ -135,18 +175,29 @@ class ExecutionLimiter:
         error: Optional[str] = None
     ):
         """Record execution details in history"""
-        self.execution_history.append({
-            "execution_id": execution_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "success": success,
-            "duration": duration,
-            "memory_used": memory_used,
-            "error": error
-        })
+        history = self.execution_history
+        if len(history) == history.maxlen:
+            # The append below evicts the oldest record
+            evicted = history[0]
+            self._successes -= evicted.success
+            self._duration_sum -= evicted.duration
+            self._memory_sum -= evicted.memory_used
+        
+        self._successes += success
+        self._duration_sum += duration
+        self._memory_sum += memory_used
+        history.append(ExecutionRecord(
+            execution_id=execution_id,
+            timestamp=datetime.utcnow().isoformat(),
+            success=success,
+            duration=duration,
+            memory_used=memory_used,
+            error=error
+        ))
     
     async def _periodic_cleanup(self):
         """Perform periodic cleanup of resources"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         if current_time - self.last_cleanup > self.cleanup_interval:
             logger.info("Performing periodic cleanup")
@@ -161,12 +212,10 @@ class ExecutionLimiter:
                 if data["start_time"] > cutoff_time
             }
             
-            # Reset memory tracking if usage is high
+            # Report high memory usage
             current_memory = self._get_memory_usage()
             if current_memory > self.max_memory_mb * 0.8:
                 logger.warning(f"High memory usage detected: {current_memory:.2f}MB")
-                tracemalloc.clear_traces()
-                gc.collect()
             
             self.last_cleanup = current_time
     
@@ -182,23 +231,22 @@ class ExecutionLimiter:
             }
         
         total = len(self.execution_history)
-        successful = sum(1 for e in self.execution_history if e["success"])
-        avg_duration = sum(e["duration"] for e in self.execution_history) / total
-        avg_memory = sum(e["memory_used"] for e in self.execution_history) / total
         
         return {
             "total_executions": total,
-            "success_rate": successful / total * 100,
-            "avg_duration": avg_duration,
-            "avg_memory": avg_memory,
+            "success_rate": self._successes / total * 100,
+            "avg_duration": self._duration_sum / total,
+            "avg_memory": self._memory_sum / total,
             "active_executions": len(self.active_executions),
             "current_memory": self._get_memory_usage()
         }
     
     def cleanup(self):
         """Clean up resources"""
-        tracemalloc.stop()
         self.execution_history.clear()
+        self._successes = 0
+        self._duration_sum = 0.0
+        self._memory_sum = 0.0
         self.active_executions.clear()
         gc.collect()
 
@@ -234,15 +282,15 @@ class CircuitBreaker:
             self._on_success()
             return result
             
-        except self.expected_exception as e:
+        except self.expected_exception:
             self._on_failure()
-            raise e
+            raise
     
     def _should_attempt_reset(self) -> bool:
         """Check if we should attempt to reset the circuit"""
         return (
-            self.last_failure_time and
-            time.time() - self.last_failure_time >= self.recovery_timeout
+            self.last_failure_time is not None and
+            time.monotonic() - self.last_failure_time >= self.recovery_timeout
         )
     
     def _on_success(self):
@@ -253,7 +301,7 @@ class CircuitBreaker:
     def _on_failure(self):
         """Handle failed execution"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
         
         if self.failure_count >= self.failure_threshold:
             self.state = "open"
@@ -3,26 +3,155 @@ Agent Factory for dynamic agent creation
 Creates agent instances at runtime based on specifications
 """
 
+import functools
 import logging
-from typing import Dict, Type, Optional, Any, List
+from typing import Dict, Type, Optional, Any, Callable, List, Tuple, Iterable, Mapping, Pattern
 from dataclasses import dataclass
 import importlib
 import inspect
+import re
+import sys
+from types import MappingProxyType
 
 from .base import BaseAgent, AgentType, ConversationalAgent
-from .code_reviewer import CodeReviewAgent
-from .testing_agent import TestingAgent
-from .git_agent import GitAgent
-from .scaffolder import ScaffolderAgent
-from .technical_writer import TechnicalWriterAgent
-from .architect import ArchitectAgent
-from .idea_generator import IdeaGeneratorAgent
-# Communication agent not yet implemented
 from .specifications import AgentSpecification
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+# Agent type to create when a specification names no known agent or template
+_TYPE_FALLBACK: Dict[AgentType, str] = {
+    AgentType.CODE: 'scaffolder',
+    AgentType.TESTING: 'testing_agent',
+    AgentType.DOCUMENTATION: 'technical_writer',
+    AgentType.ANALYSIS: 'code_reviewer',
+}
+
+# Constructor arguments the agent factory can supply
+_BUILDER_ARGUMENTS = frozenset(['config', 'model', 'name', 'agent_type'])
+
+
+def _freeze(value: Any) -> Any:
+    """A read-only copy of a template value: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Agent configuration templates, shared by every factory and frozen all the
+# way down so that no factory or agent can change another's
+_AGENT_CONFIGS: Mapping[str, Mapping[str, Any]] = _freeze({
+    'python_backend': {
+        'base_class': 'scaffolder',
+        'config': {
+            'language': 'python',
+            'framework': 'fastapi',
+            'include_tests': True,
+            'include_docker': True
+        }
+    },
+    'frontend_vue': {
+        'base_class': 'scaffolder',
+        'config': {
+            'language': 'typescript',
+            'framework': 'vue',
+            'include_tests': True,
+            'include_styles': True
+        }
+    },
+    'frontend_react': {
+        'base_class': 'scaffolder',
+        'config': {
+            'language': 'typescript',
+            'framework': 'react',
+            'include_tests': True,
+            'include_styles': True
+        }
+    },
+    'database_designer': {
+        'base_class': 'conversational',
+        'config': {
+            'system_prompt': """You are a database design expert. You help design efficient,
+            scalable database schemas. You understand normalization, indexing strategies,
+            query optimization, and can work with SQL and NoSQL databases.""",
+            'agent_type': AgentType.ANALYSIS
+        }
+    },
+    'devops_engineer': {
+        'base_class': 'conversational',
+        'config': {
+            'system_prompt': """You are a DevOps engineer specializing in CI/CD, containerization,
+            and cloud deployment. You can create Docker configurations, Kubernetes manifests,
+            CI/CD pipelines, and infrastructure as code.""",
+            'agent_type': AgentType.DEPLOYMENT
+        }
+    },
+    'qa_engineer': {
+        'base_class': 'testing_agent',
+        'config': {
+            'test_frameworks': ['pytest', 'jest', 'mocha', 'junit'],
+            'include_e2e': True,
+            'include_integration': True
+        }
+    },
+    'security_analyst': {
+        'base_class': 'code_reviewer',
+        'config': {
+            'focus': 'security',
+            'check_vulnerabilities': True,
+            'check_dependencies': True
+        }
+    },
+    'performance_optimizer': {
+        'base_class': 'conversational',
+        'config': {
+            'system_prompt': """You are a performance optimization expert. You analyze code
+            for performance bottlenecks, suggest optimizations, and help with caching strategies,
+            query optimization, and algorithmic improvements.""",
+            'agent_type': AgentType.ANALYSIS
+        }
+    }
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _system_prompt(name: str, responsibilities: tuple, technologies: tuple, tools: tuple) -> str:
+    """Render the system prompt for an agent with no template prompt"""
+    prompt = f"You are {name}, a specialized AI agent."
+    
+    if responsibilities:
+        prompt += f" Your responsibilities include: {', '.join(responsibilities)}."
+    
+    if technologies:
+        tech_names = [t.value if hasattr(t, 'value') else str(t) for t in technologies]
+        prompt += f" You are expert in: {', '.join(tech_names)}."
+    
+    if tools:
+        prompt += f" You have access to these tools: {', '.join(tools)}."
+    
+    prompt += " Provide helpful, accurate, and detailed assistance within your domain of expertise."
+    
+    return prompt
+
+
+def _keyword_index(keys: Iterable[str]) -> Tuple[Pattern, Dict[str, int]]:
+    """Build a pattern finding any of the keys, with each key's rank in order"""
+    ranks = {key: rank for rank, key in enumerate(keys)}
+    # The lookahead matches at every position, so overlapping keys are all
+    # seen, and the alternation reports the earliest ranked key starting there
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, ranks)) + '))')
+    return pattern, ranks
+
+
+def _first_keyword(index: Tuple[Pattern, Dict[str, int]], text: str) -> Optional[str]:
+    """The earliest ranked key occurring in text, found in one scan of it"""
+    pattern, ranks = index
+    if not ranks:
+        return None
+    return min((m.group(1) for m in pattern.finditer(text)), key=ranks.__getitem__, default=None)
+
 
 class AgentFactory:
     """Factory for creating agent instances dynamically"""
@@ -38,99 +167,33 @@ class AgentFactory:
         self.config = config
         self.model = model
         
-        # Registry of available agent classes
-        self.agent_registry: Dict[str, Type[BaseAgent]] = {
+        # Registry of available agent classes as (module, class name), so that
+        # an agent's module is only imported once an agent of its type is created
+        self.agent_registry: Dict[str, Tuple[str, str]] = {
             # Code-related agents
-            'code_reviewer': CodeReviewAgent,
-            'testing_agent': TestingAgent,
-            'git_agent': GitAgent,
-            'scaffolder': ScaffolderAgent,
+            'code_reviewer': ('.code_reviewer', 'CodeReviewAgent'),
+            'testing_agent': ('.testing_agent', 'TestingAgent'),
+            'git_agent': ('.git_agent', 'GitAgent'),
+            'scaffolder': ('.scaffolder', 'ScaffolderAgent'),
             
             # Documentation and design
-            'technical_writer': TechnicalWriterAgent,
-            'architect': ArchitectAgent,
-            'idea_generator': IdeaGeneratorAgent,
+            'technical_writer': ('.technical_writer', 'TechnicalWriterAgent'),
+            'architect': ('.architect', 'ArchitectAgent'),
+            'idea_generator': ('.idea_generator', 'IdeaGeneratorAgent'),
             
             # Communication (placeholder for future implementation)
-            # 'communication': CommunicationAgent,
+            # 'communication': ('.communication_agent', 'CommunicationAgent'),
             
             # Generic conversational agent (can be configured for any purpose)
-            'conversational': ConversationalAgent,
+            'conversational': ('.base', 'ConversationalAgent'),
         }
+        self._class_cache: Dict[str, Type[BaseAgent]] = {}
+        self._registry_index: Optional[Tuple[Pattern, Dict[str, int]]] = None
+        self._builder_cache: Dict[Type[BaseAgent], Callable[[AgentSpecification, Dict[str, Any]], BaseAgent]] = {}
         
-        # Agent configuration templates
-        self.agent_configs: Dict[str, Dict[str, Any]] = {
-            'python_backend': {
-                'base_class': 'scaffolder',
-                'config': {
-                    'language': 'python',
-                    'framework': 'fastapi',
-                    'include_tests': True,
-                    'include_docker': True
-                }
-            },
-            'frontend_vue': {
-                'base_class': 'scaffolder',
-                'config': {
-                    'language': 'typescript',
-                    'framework': 'vue',
-                    'include_tests': True,
-                    'include_styles': True
-                }
-            },
-            'frontend_react': {
-                'base_class': 'scaffolder',
-                'config': {
-                    'language': 'typescript',
-                    'framework': 'react',
-                    'include_tests': True,
-                    'include_styles': True
-                }
-            },
-            'database_designer': {
-                'base_class': 'conversational',
-                'config': {
-                    'system_prompt': """You are a database design expert. You help design efficient,
-                    scalable database schemas. You understand normalization, indexing strategies,
-                    query optimization, and can work with SQL and NoSQL databases.""",
-                    'agent_type': AgentType.ANALYSIS
-                }
-            },
-            'devops_engineer': {
-                'base_class': 'conversational',
-                'config': {
-                    'system_prompt': """You are a DevOps engineer specializing in CI/CD, containerization,
-                    and cloud deployment. You can create Docker configurations, Kubernetes manifests,
-                    CI/CD pipelines, and infrastructure as code.""",
-                    'agent_type': AgentType.DEPLOYMENT
-                }
-            },
-            'qa_engineer': {
-                'base_class': 'testing_agent',
-                'config': {
-                    'test_frameworks': ['pytest', 'jest', 'mocha', 'junit'],
-                    'include_e2e': True,
-                    'include_integration': True
-                }
-            },
-            'security_analyst': {
-                'base_class': 'code_reviewer',
-                'config': {
-                    'focus': 'security',
-                    'check_vulnerabilities': True,
-                    'check_dependencies': True
-                }
-            },
-            'performance_optimizer': {
-                'base_class': 'conversational',
-                'config': {
-                    'system_prompt': """You are a performance optimization expert. You analyze code
-                    for performance bottlenecks, suggest optimizations, and help with caching strategies,
-                    query optimization, and algorithmic improvements.""",
-                    'agent_type': AgentType.ANALYSIS
-                }
-            }
-        }
+        # Agent configuration templates, copied so registrations stay per factory
+        self.agent_configs: Dict[str, Mapping[str, Any]] = dict(_AGENT_CONFIGS)
+        self._template_index: Optional[Tuple[Pattern, Dict[str, int]]] = None
         
         logger.info(f"Initialized AgentFactory with {len(self.agent_registry)} agent types")
     
@@ -176,33 +239,68 @@ class AgentFactory:
         Returns:
             Agent class or None if not found
         """
-        # First, check if there's a direct mapping from the spec name
+        # An explicitly chosen agent type takes precedence
+        if spec.base_class in self.agent_registry:
+            return self._resolve(spec.base_class)
+        
+        # Otherwise, check if there's a mapping from the spec name
         name_lower = spec.name.lower()
         
         # Check for exact matches in registry
-        for key, agent_class in self.agent_registry.items():
-            if key in name_lower:
-                return agent_class
+        if self._registry_index is None:
+            self._registry_index = _keyword_index(self.agent_registry)
+        key = _first_keyword(self._registry_index, name_lower)
+        if key is not None:
+            return self._resolve(key)
         
         # Check agent configs for template matches
-        for template_name, template_config in self.agent_configs.items():
-            if template_name in name_lower:
-                base_class_name = template_config.get('base_class')
-                if base_class_name in self.agent_registry:
-                    return self.agent_registry[base_class_name]
-        
-        # Check based on agent type
-        if spec.type == AgentType.CODE:
-            return self.agent_registry.get('scaffolder')
-        elif spec.type == AgentType.TESTING:
-            return self.agent_registry.get('testing_agent')
-        elif spec.type == AgentType.DOCUMENTATION:
-            return self.agent_registry.get('technical_writer')
-        elif spec.type == AgentType.ANALYSIS:
-            return self.agent_registry.get('code_reviewer')
-        
-        # Default to conversational agent
-        return self.agent_registry.get('conversational')
+        template_name = self._find_template(name_lower)
+        if template_name is not None:
+            base_class_name = self.agent_configs[template_name].get('base_class')
+            if base_class_name in self.agent_registry:
+                return self._resolve(base_class_name)
+        
+        # Check based on agent type, defaulting to conversational agent
+        return self._resolve(_TYPE_FALLBACK.get(spec.type, 'conversational'))
+    
+    def _resolve(self, name: str) -> Optional[Type[BaseAgent]]:
+        """
+        Get the agent class registered under a name, importing its module
+        the first time
+        
+        Args:
+            name: Registered agent type name
+            
+        Returns:
+            Agent class or None if the name is not registered
+        """
+        agent_class = self._class_cache.get(name)
+        if agent_class is None and name in self.agent_registry:
+            module_name, class_name = self.agent_registry[name]
+            module = importlib.import_module(module_name, __package__)
+            agent_class = self._class_cache[name] = getattr(module, class_name)
+        return agent_class
+    
+    def _find_template(self, name_lower: str) -> Optional[str]:
+        """
+        Find the configuration template an agent name refers to: the template
+        of that name, with spaces read as underscores, or else the first
+        template whose name occurs in it
+        
+        Args:
+            name_lower: Lowercased agent name
+            
+        Returns:
+            Template name or None if none occurs
+        """
+        # Names such as create_agent_from_template gives are found directly
+        template_name = name_lower.replace(' ', '_')
+        if template_name in self.agent_configs:
+            return template_name
+        
+        if self._template_index is None:
+            self._template_index = _keyword_index(self.agent_configs)
+        return _first_keyword(self._template_index, name_lower)
     
     def _prepare_agent_config(self, spec: AgentSpecification) -> Dict[str, Any]:
         """
@@ -217,19 +315,18 @@ class AgentFactory:
         config = {}
         
         # Check if there's a template configuration
-        name_lower = spec.name.lower()
-        for template_name, template_config in self.agent_configs.items():
-            if template_name in name_lower:
-                config.update(template_config.get('config', {}))
-                break
+        template_name = self._find_template(spec.name.lower())
+        if template_name is not None:
+            config.update(self.agent_configs[template_name].get('config', {}))
         
         # Add spec's context requirements
         config.update(spec.context_requirements)
         
         # Add common configuration
         config['agent_id'] = spec.agent_id
-        config['responsibilities'] = spec.responsibilities
-        config['tools'] = spec.tools
+        # Interned so that agents sharing responsibilities or tools share the strings
+        config['responsibilities'] = tuple(map(sys.intern, spec.responsibilities))
+        config['tools'] = tuple(map(sys.intern, spec.tools))
         
         return config
     
@@ -250,63 +347,80 @@ class AgentFactory:
         Returns:
             Instantiated agent
         """
-        # Get the constructor signature
-        sig = inspect.signature(agent_class.__init__)
-        params = sig.parameters
+        builder = self._builder_cache.get(agent_class)
+        if builder is None:
+            builder = self._builder_cache[agent_class] = self._make_builder(agent_class)
+        agent = builder(spec, config)
         
-        # Prepare constructor arguments
-        kwargs = {}
+        # Set additional attributes
+        agent.agent_id = spec.agent_id
         
-        # Common parameters that most agents accept
-        if 'config' in params and self.config:
-            kwargs['config'] = self.config
+        # Store the full configuration
+        agent.custom_config = config
         
-        if 'model' in params and self.model:
-            kwargs['model'] = self.model
-        
-        if 'name' in params:
-            kwargs['name'] = spec.name
-        
-        if 'agent_type' in params:
-            kwargs['agent_type'] = spec.type
-        
-        # For ConversationalAgent, add system prompt if available
-        if agent_class == ConversationalAgent:
-            if 'system_prompt' in config:
-                kwargs['system_prompt'] = config['system_prompt']
-            else:
-                # Generate a system prompt based on responsibilities
-                kwargs['system_prompt'] = self._generate_system_prompt(spec)
+        return agent
+    
+    def _make_builder(
+        self,
+        agent_class: Type[BaseAgent]
+    ) -> Callable[[AgentSpecification, Dict[str, Any]], BaseAgent]:
+        """
+        Make a function constructing agents of a class with the arguments its
+        constructor accepts, inspecting the signature only once
         
-        # Try to instantiate the agent
-        try:
-            agent = agent_class(**kwargs)
-            
-            # Set additional attributes
-            if hasattr(agent, 'agent_id'):
-                agent.agent_id = spec.agent_id
-            
-            # Store the full configuration
-            if hasattr(agent, 'custom_config'):
-                agent.custom_config = config
-            
-            return agent
-            
-        except TypeError as e:
-            # If instantiation fails, try with minimal parameters
-            logger.warning(f"Failed with full params, trying minimal: {e}")
+        Args:
+            agent_class: The agent class to instantiate
             
-            # Try minimal instantiation
-            if agent_class == ConversationalAgent:
+        Returns:
+            Function taking the agent specification and configuration
+        """
+        # ConversationalAgent passes everything through to BaseAgent, so its
+        # own signature says nothing about the arguments it needs
+        if agent_class is ConversationalAgent:
+            def build(spec: AgentSpecification, config: Dict[str, Any]) -> BaseAgent:
+                if 'system_prompt' in config:
+                    system_prompt = config['system_prompt']
+                else:
+                    # Generate a system prompt based on responsibilities
+                    system_prompt = self._generate_system_prompt(spec)
                 return ConversationalAgent(
                     name=spec.name,
                     agent_type=spec.type,
-                    system_prompt=self._generate_system_prompt(spec),
+                    system_prompt=system_prompt,
                     model=self.model
                 )
-            else:
-                # For other agents, try with just config
-                return agent_class(config=self.config)
+            return build
+        
+        # Common parameters that most agents accept
+        params = inspect.signature(agent_class.__init__).parameters
+        unsupported = [
+            param.name for param in list(params.values())[1:]  # Skip self
+            if param.default is param.empty
+            and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+            and param.name not in _BUILDER_ARGUMENTS
+        ]
+        if unsupported:
+            raise ValueError(
+                f"{agent_class.__name__} requires arguments the factory cannot supply: "
+                f"{', '.join(unsupported)}"
+            )
+        takes_config = 'config' in params
+        takes_model = 'model' in params
+        takes_name = 'name' in params
+        takes_type = 'agent_type' in params
+        
+        def build(spec: AgentSpecification, config: Dict[str, Any]) -> BaseAgent:
+            kwargs = {}
+            if takes_config and self.config:
+                kwargs['config'] = self.config
+            if takes_model and self.model:
+                kwargs['model'] = self.model
+            if takes_name:
+                kwargs['name'] = spec.name
+            if takes_type:
+                kwargs['agent_type'] = spec.type
+            return agent_class(**kwargs)
+        return build
     
     def _generate_system_prompt(self, spec: AgentSpecification) -> str:
         """
@@ -318,21 +432,12 @@ class AgentFactory:
         Returns:
             Generated system prompt
         """
-        prompt = f"You are {spec.name}, a specialized AI agent."
-        
-        if spec.responsibilities:
-            prompt += f" Your responsibilities include: {', '.join(spec.responsibilities)}."
-        
-        if spec.technologies:
-            tech_names = [t.value if hasattr(t, 'value') else str(t) for t in spec.technologies]
-            prompt += f" You are expert in: {', '.join(tech_names)}."
-        
-        if spec.tools:
-            prompt += f" You have access to these tools: {', '.join(spec.tools)}."
-        
-        prompt += " Provide helpful, accurate, and detailed assistance within your domain of expertise."
-        
-        return prompt
+        return _system_prompt(
+            spec.name,
+            tuple(spec.responsibilities),
+            tuple(spec.technologies),
+            tuple(spec.tools)
+        )
     
     def register_agent_type(self, name: str, agent_class: Type[BaseAgent]):
         """
@@ -342,7 +447,10 @@ class AgentFactory:
             name: Name for the agent type
             agent_class: The agent class
         """
-        self.agent_registry[name] = agent_class
+        self.agent_registry[name] = (agent_class.__module__, agent_class.__qualname__)
+        self._class_cache[name] = agent_class
+        self._builder_cache.pop(agent_class, None)
+        self._registry_index = None
         logger.info(f"Registered new agent type: {name}")
     
     def register_agent_config(self, name: str, config: Dict[str, Any]):
@@ -354,6 +462,7 @@ class AgentFactory:
             config: Configuration template
         """
         self.agent_configs[name] = config
+        self._template_index = None
         logger.info(f"Registered new agent config: {name}")
     
     def get_available_types(self) -> List[str]:
@@ -364,7 +473,7 @@ class AgentFactory:
         """Get list of available configuration templates"""
         return list(self.agent_configs.keys())
     
-    async def create_agent_from_template(
+    def create_agent_from_template(
         self,
         template_name: str,
         custom_name: Optional[str] = None,
@@ -390,13 +499,12 @@ class AgentFactory:
         # Create agent specification
         spec = AgentSpecification(
             name=custom_name or template_name.replace('_', ' ').title(),
-            type=template.get('agent_type', AgentType.CODE)
+            type=template.get('agent_type', AgentType.CODE),
+            base_class=base_class_name
         )
         
-        # Merge configurations
-        config = template.get('config', {}).copy()
-        if additional_config:
-            config.update(additional_config)
+        # Merge configurations into a dict of the spec's own
+        config = {**template.get('config', {}), **(additional_config or {})}
         
         spec.context_requirements = config
         
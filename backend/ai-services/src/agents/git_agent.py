@@ -4,9 +4,12 @@ Git Agent - Handles version control operations
 
 import os
 import json
+import inspect
+import functools
+import posixpath
 import logging
 import subprocess
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -20,6 +23,64 @@ from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+# Written to every repository the agent initializes
+_DEFAULT_GITIGNORE = b"""# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+env/
+venv/
+.venv
+pip-log.txt
+pip-delete-this-directory.txt
+
+# Node
+node_modules/
+npm-debug.log*
+yarn-debug.log*
+yarn-error.log*
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+.DS_Store
+
+# Environment
+.env
+.env.local
+*.local
+
+# Build
+dist/
+build/
+*.egg-info/
+
+# Testing
+.coverage
+htmlcov/
+.pytest_cache/
+coverage/
+
+# Logs
+*.log
+logs/
+
+# Database
+*.db
+*.sqlite3
+
+# Temporary
+tmp/
+temp/
+"""
+
+# Summary line git commit prints, e.g. "[main (root-commit) 1a2b3c4] Subject"
+_COMMIT_SUMMARY_PATTERN = re.compile(r'^\[.*? ([0-9a-f]{7,40})\] ', re.MULTILINE)
+
 
 class GitOperation(Enum):
     """Supported Git operations"""
@@ -54,6 +115,16 @@ class CommitType(Enum):
     REVERT = "revert"    # Revert previous commit
 
 
+# Commit types by lowercase name, plus the change types callers describe
+_COMMIT_TYPES: Dict[str, CommitType] = {
+    **{commit_type.name.lower(): commit_type for commit_type in CommitType},
+    "feature": CommitType.FEAT,
+    "bugfix": CommitType.FIX,
+    "documentation": CommitType.DOCS,
+    "performance": CommitType.PERF,
+}
+
+
 @dataclass
 class GitRepository:
     """Git repository information"""
@@ -78,6 +149,31 @@ class GitCommit:
     deletions: int = 0
 
 
+# Git processes allowed to read one repository at the same time
+_MAX_REPO_READERS = 8
+
+
+def _repo_operation(writes: bool):
+    """
+    Run a GitAgent method under its repository's semaphore. Writers to a
+    repository run one at a time so they do not race for .git/index.lock;
+    readers run up to _MAX_REPO_READERS at a time.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        # The repository path is the first parameter after self, whatever its name
+        path_parameter = list(signature.parameters)[1]
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            repo_path = signature.bind(self, *args, **kwargs).arguments[path_parameter]
+            write_semaphore, read_semaphore = self._repo_semaphores(repo_path)
+            async with write_semaphore if writes else read_semaphore:
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class GitAgent(BaseAgent):
     """
     Agent responsible for Git version control operations
@@ -97,25 +193,115 @@ class GitAgent(BaseAgent):
         self.config = config
         self.execution_limiter = execution_limiter
         self.repositories: Dict[str, GitRepository] = {}
+        
+        # Write and read semaphores per repository path
+        self._repo_locks: Dict[str, Tuple[asyncio.Semaphore, asyncio.Semaphore]] = {}
+        
+        # Environment for every git child: no optional index locks, no
+        # credential prompts, and untranslated messages for the stderr checks
+        self._git_env = {
+            **os.environ,
+            "GIT_OPTIONAL_LOCKS": "0",
+            "GIT_TERMINAL_PROMPT": "0",
+            "LC_ALL": "C",
+        }
+        
+        # Operation handlers for execute, each taking the repository path and the request
+        self._operations: Dict[str, Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+            GitOperation.INIT.value: lambda path, data: self.initialize_repository(
+                path,
+                data.get("branch", "main")
+            ),
+            GitOperation.ADD.value: lambda path, data: self.add_files(
+                path,
+                data.get("files")
+            ),
+            GitOperation.COMMIT.value: lambda path, data: self.create_commit(
+                path,
+                data.get("message", "Update files"),
+                _COMMIT_TYPES[data["type"].lower()] if data.get("type") else None,
+                data.get("scope"),
+                data.get("body"),
+                data.get("breaking_change", False)
+            ),
+            GitOperation.BRANCH.value: lambda path, data: self.create_branch(
+                path,
+                data.get("name"),
+                data.get("checkout", True)
+            ),
+            GitOperation.CHECKOUT.value: lambda path, data: self.checkout_branch(
+                path,
+                data.get("branch")
+            ),
+            GitOperation.MERGE.value: lambda path, data: self.merge_branch(
+                path,
+                data.get("source_branch"),
+                data.get("strategy", "recursive")
+            ),
+            GitOperation.STATUS.value: lambda path, data: self.get_status(path),
+            GitOperation.LOG.value: lambda path, data: self.get_log(
+                path,
+                data.get("limit", 10),
+                data.get("oneline", False)
+            ),
+            GitOperation.PUSH.value: lambda path, data: self.push_to_remote(
+                path,
+                data.get("remote", "origin"),
+                data.get("branch"),
+                data.get("tags", False)
+            ),
+            GitOperation.CLONE.value: lambda path, data: self.clone_repository(
+                data.get("url"),
+                data.get("target_path"),
+                data.get("branch")
+            ),
+            GitOperation.TAG.value: lambda path, data: self.create_tag(
+                path,
+                data.get("name"),
+                data.get("message"),
+                data.get("annotated", True)
+            ),
+        }
+    
+    def _repo_semaphores(self, repo_path: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Get the write and read semaphores of a repository, creating them on first use"""
+        # Spellings of the same directory must share one set of semaphores
+        key = os.path.realpath(repo_path)
+        semaphores = self._repo_locks.get(key)
+        if semaphores is None:
+            semaphores = (asyncio.Semaphore(1), asyncio.Semaphore(_MAX_REPO_READERS))
+            self._repo_locks[key] = semaphores
+        return semaphores
     
-    async def _run_git_command(self, command: List[str], cwd: str = ".") -> Tuple[bool, str, str]:
-        """Run a Git command and return success, stdout, stderr"""
+    async def _run_git_command(self, command: List[str], cwd: str = ".",
+                               capture: str = "text") -> Tuple[bool, Any, str]:
+        """
+        Run a Git command and return success, stdout, stderr. stdout is
+        captured as stripped "text", as the raw "bytes" git wrote, or
+        discarded with "none" and returned as an empty string.
+        """
         try:
             result = await asyncio.create_subprocess_exec(
                 "git", *command,
                 cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
+                env=self._git_env,
+                stdout=asyncio.subprocess.DEVNULL if capture == "none" else asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             stdout, stderr = await result.communicate()
             
             success = result.returncode == 0
+            if capture == "bytes":
+                return success, stdout, stderr.decode().strip()
+            if capture == "none":
+                return success, "", stderr.decode().strip()
             return success, stdout.decode().strip(), stderr.decode().strip()
             
         except Exception as e:
             logger.error(f"Error running git command {command}: {str(e)}")
-            return False, "", str(e)
+            return False, b"" if capture == "bytes" else "", str(e)
     
+    @_repo_operation(writes=True)
     async def initialize_repository(self, path: str, initial_branch: str = "main") -> Dict[str, Any]:
         """Initialize a new Git repository"""
         logger.info(f"Initializing Git repository at {path}")
@@ -123,77 +309,25 @@ class GitAgent(BaseAgent):
         # Create directory if it doesn't exist
         Path(path).mkdir(parents=True, exist_ok=True)
         
-        # Initialize repository
-        success, stdout, stderr = await self._run_git_command(["init"], cwd=path)
+        # Initialize repository on its initial branch
+        success, _, stderr = await self._run_git_command(
+            ["init", "--initial-branch", initial_branch],
+            cwd=path,
+            capture="none"
+        )
         if not success:
             return {"status": "error", "message": f"Failed to initialize repository: {stderr}"}
         
-        # Set initial branch name
-        await self._run_git_command(["branch", "-M", initial_branch], cwd=path)
-        
         # Create initial .gitignore
-        gitignore_content = """# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-env/
-venv/
-.venv
-pip-log.txt
-pip-delete-this-directory.txt
-
-# Node
-node_modules/
-npm-debug.log*
-yarn-debug.log*
-yarn-error.log*
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-.DS_Store
-
-# Environment
-.env
-.env.local
-*.local
-
-# Build
-dist/
-build/
-*.egg-info/
-
-# Testing
-.coverage
-htmlcov/
-.pytest_cache/
-coverage/
-
-# Logs
-*.log
-logs/
-
-# Database
-*.db
-*.sqlite3
-
-# Temporary
-tmp/
-temp/
-"""
-        
         gitignore_path = Path(path) / ".gitignore"
-        gitignore_path.write_text(gitignore_content)
+        gitignore_path.write_bytes(_DEFAULT_GITIGNORE)
         
         # Add and commit .gitignore
-        await self._run_git_command(["add", ".gitignore"], cwd=path)
+        await self._run_git_command(["add", ".gitignore"], cwd=path, capture="none")
         await self._run_git_command(
             ["commit", "-m", "Initial commit: Add .gitignore"],
-            cwd=path
+            cwd=path,
+            capture="none"
         )
         
         # Store repository info
@@ -212,16 +346,17 @@ temp/
             "message": "Repository initialized successfully"
         }
     
+    @_repo_operation(writes=True)
     async def add_files(self, repo_path: str, files: List[str] = None) -> Dict[str, Any]:
         """Add files to staging area"""
         logger.info(f"Adding files to repository at {repo_path}")
         
         if files is None:
             # Add all files
-            success, stdout, stderr = await self._run_git_command(["add", "."], cwd=repo_path)
+            success, _, stderr = await self._run_git_command(["add", "."], cwd=repo_path, capture="none")
         else:
             # Add specific files
-            success, stdout, stderr = await self._run_git_command(["add"] + files, cwd=repo_path)
+            success, _, stderr = await self._run_git_command(["add"] + files, cwd=repo_path, capture="none")
         
         if not success:
             return {"status": "error", "message": f"Failed to add files: {stderr}"}
@@ -235,6 +370,7 @@ temp/
             "message": "Files added to staging area"
         }
     
+    @_repo_operation(writes=True)
     async def create_commit(self, repo_path: str, message: str, 
                           commit_type: Optional[CommitType] = None,
                           scope: Optional[str] = None,
@@ -272,11 +408,15 @@ temp/
                 return {"status": "info", "message": "Nothing to commit, working tree clean"}
             return {"status": "error", "message": f"Failed to create commit: {stderr}"}
         
-        # Get commit info
-        success, commit_hash, _ = await self._run_git_command(
-            ["rev-parse", "HEAD"],
-            cwd=repo_path
-        )
+        # Get commit info, which git commit already printed
+        summary = _COMMIT_SUMMARY_PATTERN.search(stdout)
+        if summary:
+            commit_hash = summary.group(1)
+        else:
+            success, commit_hash, _ = await self._run_git_command(
+                ["rev-parse", "HEAD"],
+                cwd=repo_path
+            )
         
         return {
             "status": "success",
@@ -285,6 +425,7 @@ temp/
             "timestamp": datetime.now().isoformat()
         }
     
+    @_repo_operation(writes=True)
     async def create_branch(self, repo_path: str, branch_name: str, 
                           checkout: bool = True) -> Dict[str, Any]:
         """Create a new branch"""
@@ -292,14 +433,16 @@ temp/
         
         # Create branch
         if checkout:
-            success, stdout, stderr = await self._run_git_command(
+            success, _, stderr = await self._run_git_command(
                 ["checkout", "-b", branch_name],
-                cwd=repo_path
+                cwd=repo_path,
+                capture="none"
             )
         else:
-            success, stdout, stderr = await self._run_git_command(
+            success, _, stderr = await self._run_git_command(
                 ["branch", branch_name],
-                cwd=repo_path
+                cwd=repo_path,
+                capture="none"
             )
         
         if not success:
@@ -318,13 +461,15 @@ temp/
             "message": f"Branch {branch_name} created successfully"
         }
     
+    @_repo_operation(writes=True)
     async def checkout_branch(self, repo_path: str, branch_name: str) -> Dict[str, Any]:
         """Checkout an existing branch"""
         logger.info(f"Checking out branch {branch_name} in repository at {repo_path}")
         
-        success, stdout, stderr = await self._run_git_command(
+        success, _, stderr = await self._run_git_command(
             ["checkout", branch_name],
-            cwd=repo_path
+            cwd=repo_path,
+            capture="none"
         )
         
         if not success:
@@ -340,6 +485,7 @@ temp/
             "message": f"Switched to branch {branch_name}"
         }
     
+    @_repo_operation(writes=True)
     async def merge_branch(self, repo_path: str, source_branch: str, 
                           strategy: str = "recursive") -> Dict[str, Any]:
         """Merge a branch into current branch"""
@@ -354,14 +500,15 @@ temp/
         if not success:
             return {"status": "error", "message": "Failed to get current branch"}
         
-        # Perform merge
+        # Perform merge; its output is only searched, so leave it undecoded
         success, stdout, stderr = await self._run_git_command(
             ["merge", source_branch, "--strategy", strategy],
-            cwd=repo_path
+            cwd=repo_path,
+            capture="bytes"
         )
         
         if not success:
-            if "CONFLICT" in stdout or "CONFLICT" in stderr:
+            if b"CONFLICT" in stdout or "CONFLICT" in stderr:
                 # Get conflict files
                 success, conflicts, _ = await self._run_git_command(
                     ["diff", "--name-only", "--diff-filter=U"],
@@ -383,52 +530,64 @@ temp/
             "source_branch": source_branch
         }
     
+    @_repo_operation(writes=False)
     async def get_status(self, repo_path: str) -> Dict[str, Any]:
         """Get repository status"""
         logger.info(f"Getting status for repository at {repo_path}")
         
-        # Get porcelain status for parsing
+        # Get NUL-separated porcelain status, which also names the branch
         success, stdout, stderr = await self._run_git_command(
-            ["status", "--porcelain"],
-            cwd=repo_path
+            ["status", "--porcelain=v2", "-z", "--branch"],
+            cwd=repo_path,
+            capture="bytes"
         )
         
         if not success:
             return {"status": "error", "message": f"Failed to get status: {stderr}"}
         
         # Parse status
+        current_branch = "unknown"
         staged = []
         modified = []
         untracked = []
         deleted = []
         
-        for line in stdout.split("\n"):
-            if not line:
+        entries = iter(stdout.split(b"\0"))
+        for entry in entries:
+            kind = entry[:1]
+            if kind == b"1":  # Changed: 1 XY sub mH mI mW hH hI path
+                file_path = entry.split(b" ", 8)[8]
+            elif kind == b"2":  # Renamed or copied, followed by the original path
+                file_path = entry.split(b" ", 9)[9]
+                next(entries, None)
+            elif kind == b"u":  # Unmerged
+                file_path = entry.split(b" ", 10)[10]
+            elif kind == b"?":
+                untracked.append(entry[2:].decode("utf-8", "surrogateescape"))
+                continue
+            else:
+                if entry.startswith(b"# branch.head "):
+                    current_branch = entry[14:].decode("utf-8", "surrogateescape")
+                    if current_branch == "(detached)":
+                        current_branch = "HEAD"  # As rev-parse --abbrev-ref names it
                 continue
             
-            status_code = line[:2]
-            file_path = line[3:]
+            file_path = file_path.decode("utf-8", "surrogateescape")
+            index_status = entry[2:3]
+            worktree_status = entry[3:4]
             
-            if status_code[0] == "A":
+            if index_status == b"A":
                 staged.append(file_path)
-            elif status_code[0] == "M":
+            elif index_status == b"M":
                 staged.append(file_path)
-            elif status_code[1] == "M":
+            elif worktree_status == b"M":
                 modified.append(file_path)
-            elif status_code == "??":
-                untracked.append(file_path)
-            elif status_code[0] == "D" or status_code[1] == "D":
+            elif index_status == b"D" or worktree_status == b"D":
                 deleted.append(file_path)
         
-        # Get current branch
-        success, current_branch, _ = await self._run_git_command(
-            ["rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=repo_path
-        )
-        
         return {
             "status": "success",
-            "branch": current_branch if success else "unknown",
+            "branch": current_branch,
             "staged": staged,
             "modified": modified,
             "untracked": untracked,
@@ -436,6 +595,7 @@ temp/
             "clean": not (staged or modified or untracked or deleted)
         }
     
+    @_repo_operation(writes=False)
     async def get_log(self, repo_path: str, limit: int = 10, 
                      oneline: bool = False) -> Dict[str, Any]:
         """Get commit log"""
@@ -444,9 +604,10 @@ temp/
         if oneline:
             cmd = ["log", f"--oneline", f"-{limit}"]
         else:
-            cmd = ["log", f"-{limit}", "--pretty=format:%H|%an|%ae|%ad|%s", "--date=iso"]
+            # NUL after every field, so messages may contain any separator
+            cmd = ["log", f"-{limit}", "-z", "--pretty=format:%H%x00%an%x00%ae%x00%aI%x00%s"]
         
-        success, stdout, stderr = await self._run_git_command(cmd, cwd=repo_path)
+        success, stdout, stderr = await self._run_git_command(cmd, cwd=repo_path, capture="text" if oneline else "bytes")
         
         if not success:
             return {"status": "error", "message": f"Failed to get log: {stderr}"}
@@ -454,19 +615,17 @@ temp/
         if oneline:
             commits = stdout.split("\n") if stdout else []
         else:
-            commits = []
-            for line in stdout.split("\n"):
-                if not line:
-                    continue
-                parts = line.split("|")
-                if len(parts) >= 5:
-                    commits.append({
-                        "hash": parts[0][:7],
-                        "author": parts[1],
-                        "email": parts[2],
-                        "date": parts[3],
-                        "message": parts[4]
-                    })
+            fields = stdout.decode("utf-8", "replace").split("\0")
+            commits = [
+                {
+                    "hash": commit_hash[:7],
+                    "author": author,
+                    "email": email,
+                    "date": date,
+                    "message": message
+                }
+                for commit_hash, author, email, date, message in zip(*[iter(fields)] * 5)
+            ]
         
         return {
             "status": "success",
@@ -474,6 +633,7 @@ temp/
             "count": len(commits)
         }
     
+    @_repo_operation(writes=True)
     async def create_tag(self, repo_path: str, tag_name: str, 
                         message: Optional[str] = None,
                         annotated: bool = True) -> Dict[str, Any]:
@@ -485,7 +645,7 @@ temp/
         else:
             cmd = ["tag", tag_name]
         
-        success, stdout, stderr = await self._run_git_command(cmd, cwd=repo_path)
+        success, _, stderr = await self._run_git_command(cmd, cwd=repo_path, capture="none")
         
         if not success:
             if "already exists" in stderr:
@@ -499,6 +659,7 @@ temp/
             "message": f"Tag {tag_name} created successfully"
         }
     
+    @_repo_operation(writes=True)
     async def push_to_remote(self, repo_path: str, remote: str = "origin", 
                             branch: Optional[str] = None,
                             tags: bool = False) -> Dict[str, Any]:
@@ -512,7 +673,7 @@ temp/
         else:
             cmd = ["push", remote]
         
-        success, stdout, stderr = await self._run_git_command(cmd, cwd=repo_path)
+        success, _, stderr = await self._run_git_command(cmd, cwd=repo_path, capture="none")
         
         if not success:
             if "no upstream branch" in stderr:
@@ -522,9 +683,10 @@ temp/
                     cwd=repo_path
                 )
                 if success:
-                    success, stdout, stderr = await self._run_git_command(
+                    success, _, stderr = await self._run_git_command(
                         ["push", "--set-upstream", remote, current_branch],
-                        cwd=repo_path
+                        cwd=repo_path,
+                        capture="none"
                     )
                     if success:
                         return {
@@ -549,7 +711,7 @@ temp/
         if branch:
             cmd.extend(["-b", branch])
         
-        success, stdout, stderr = await self._run_git_command(cmd)
+        success, _, stderr = await self._run_git_command(cmd, capture="none")
         
         if not success:
             return {"status": "error", "message": f"Failed to clone: {stderr}"}
@@ -577,20 +739,7 @@ temp/
         description = changes.get("description", "")
         
         # Determine commit type
-        if change_type == "feature":
-            commit_type = CommitType.FEAT
-        elif change_type == "bugfix":
-            commit_type = CommitType.FIX
-        elif change_type == "documentation":
-            commit_type = CommitType.DOCS
-        elif change_type == "refactor":
-            commit_type = CommitType.REFACTOR
-        elif change_type == "test":
-            commit_type = CommitType.TEST
-        elif change_type == "performance":
-            commit_type = CommitType.PERF
-        else:
-            commit_type = CommitType.CHORE
+        commit_type = _COMMIT_TYPES.get(change_type, CommitType.CHORE)
         
         # Determine scope
         scope = None
@@ -601,14 +750,13 @@ temp/
                 if len(path_parts) > 1:
                     scope = path_parts[0]
             else:
-                # Find common prefix
-                common_parts = files_changed[0].split("/")
-                for file in files_changed[1:]:
-                    parts = file.split("/")
-                    common_parts = [p for i, p in enumerate(common_parts) 
-                                  if i < len(parts) and parts[i] == p]
-                if common_parts:
-                    scope = common_parts[0]
+                # Find common directory; git paths always use "/"
+                try:
+                    common = posixpath.commonpath(files_changed)
+                except ValueError:  # Absolute and relative paths mixed
+                    common = ""
+                if common:
+                    scope = common.split("/", 1)[0]
         
         # Generate message
         message = f"{commit_type.value}"
@@ -625,9 +773,14 @@ temp/
         try:
             # Parse input
             if isinstance(input_data, str):
-                try:
-                    data = json.loads(input_data)
-                except:
+                # Anything but a JSON object is the path of a repository to report on
+                data = None
+                if input_data.lstrip().startswith("{"):
+                    try:
+                        data = json.loads(input_data)
+                    except json.JSONDecodeError:
+                        pass
+                if data is None:
                     data = {"operation": "status", "path": input_data}
             else:
                 data = input_data
@@ -636,81 +789,9 @@ temp/
             repo_path = data.get("path", ".")
             
             # Execute operation
-            if operation == GitOperation.INIT.value:
-                result = await self.initialize_repository(
-                    repo_path,
-                    data.get("branch", "main")
-                )
-            
-            elif operation == GitOperation.ADD.value:
-                result = await self.add_files(
-                    repo_path,
-                    data.get("files")
-                )
-            
-            elif operation == GitOperation.COMMIT.value:
-                result = await self.create_commit(
-                    repo_path,
-                    data.get("message", "Update files"),
-                    CommitType[data.get("type", "CHORE").upper()] if data.get("type") else None,
-                    data.get("scope"),
-                    data.get("body"),
-                    data.get("breaking_change", False)
-                )
-            
-            elif operation == GitOperation.BRANCH.value:
-                result = await self.create_branch(
-                    repo_path,
-                    data.get("name"),
-                    data.get("checkout", True)
-                )
-            
-            elif operation == GitOperation.CHECKOUT.value:
-                result = await self.checkout_branch(
-                    repo_path,
-                    data.get("branch")
-                )
-            
-            elif operation == GitOperation.MERGE.value:
-                result = await self.merge_branch(
-                    repo_path,
-                    data.get("source_branch"),
-                    data.get("strategy", "recursive")
-                )
-            
-            elif operation == GitOperation.STATUS.value:
-                result = await self.get_status(repo_path)
-            
-            elif operation == GitOperation.LOG.value:
-                result = await self.get_log(
-                    repo_path,
-                    data.get("limit", 10),
-                    data.get("oneline", False)
-                )
-            
-            elif operation == GitOperation.PUSH.value:
-                result = await self.push_to_remote(
-                    repo_path,
-                    data.get("remote", "origin"),
-                    data.get("branch"),
-                    data.get("tags", False)
-                )
-            
-            elif operation == GitOperation.CLONE.value:
-                result = await self.clone_repository(
-                    data.get("url"),
-                    data.get("target_path"),
-                    data.get("branch")
-                )
-            
-            elif operation == GitOperation.TAG.value:
-                result = await self.create_tag(
-                    repo_path,
-                    data.get("name"),
-                    data.get("message"),
-                    data.get("annotated", True)
-                )
-            
+            handler = self._operations.get(operation)
+            if handler:
+                result = await handler(repo_path, data)
             else:
                 result = {
                     "status": "error",
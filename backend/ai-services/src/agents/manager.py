@@ -217,7 +217,7 @@ class AgentManager:
             # Remove oldest agent if we're at capacity
             oldest_agent = next(iter(self.agents))
             logger.warning(f"Agent limit reached, removing oldest agent: {oldest_agent}")
-            del self.agents[oldest_agent]
+            self.agents.pop(oldest_agent).cleanup()
             if oldest_agent in self.circuit_breakers:
                 del self.circuit_breakers[oldest_agent]
         
@@ -499,6 +499,8 @@ class AgentManager:
         self.execution_limiter.cleanup()
         
         # Clean up agents
+        for agent in self.agents.values():
+            agent.cleanup()
         self.agents.clear()
         self.circuit_breakers.clear()
         
@@ -547,6 +549,7 @@ class AgentManager:
                 agent_id=agent_dict['agent_id'],
                 name=agent_dict['name'],
                 type=AgentType[agent_dict['type'].upper()] if isinstance(agent_dict['type'], str) else agent_dict['type'],
+                base_class=agent_dict.get('base_class', ''),
                 technologies=agent_dict.get('technologies', []),
                 responsibilities=agent_dict.get('responsibilities', []),
                 dependencies=agent_dict.get('dependencies', []),
@@ -39,6 +39,7 @@ class AgentSpecification:
     agent_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = ""
     type: AgentType = AgentType.CODE
+    base_class: str = ""  # Registered agent type to instantiate, if already decided
     technologies: List[TechnologyStack] = field(default_factory=list)
     responsibilities: List[str] = field(default_factory=list)
     dependencies: List[str] = field(default_factory=list)  # IDs of other agents
@@ -52,6 +53,7 @@ class AgentSpecification:
             "agent_id": self.agent_id,
             "name": self.name,
             "type": self.type.value,
+            "base_class": self.base_class,
             "technologies": [t.value for t in self.technologies],
             "responsibilities": self.responsibilities,
             "dependencies": self.dependencies,
@@ -210,4 +210,50 @@ class TestArchitectAgent:
         if result.success:
             assert result.output["agent_type"] != "META"
         else:
-            assert "cannot create meta agents" in result.error.lower()
\ No newline at end of file
+            assert "cannot create meta agents" in result.error.lower()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_coalesced(self, agent, mock_model):
+        """Test that identical in-flight requests share one model call"""
+        async def slow_generate(prompt):
+            await asyncio.sleep(0.01)
+            response = Mock()
+            response.text = "AGENT_NAME: Coalesced"
+            return response
+        mock_model.generate_content_async.side_effect = slow_generate
+        
+        input_data = {
+            "agent_name": "coalesced_agent",
+            "agent_purpose": "Testing request coalescing"
+        }
+        
+        results = await asyncio.gather(*[
+            agent.generate_agent_specification(dict(input_data))
+            for _ in range(5)
+        ])
+        
+        assert results == ["AGENT_NAME: Coalesced"] * 5
+        mock_model.generate_content_async.assert_called_once()
+        assert agent._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_first_caller_does_not_cancel_others(self, agent, mock_model):
+        """Test cancelling the caller that started a shared request leaves it running for the rest"""
+        async def slow_generate(prompt):
+            await asyncio.sleep(0.01)
+            response = Mock()
+            response.text = "AGENT_NAME: Shared"
+            return response
+        mock_model.generate_content_async.side_effect = slow_generate
+        
+        input_data = {"agent_name": "shared_agent", "agent_purpose": "Testing cancellation"}
+        first = asyncio.create_task(agent.generate_agent_specification(dict(input_data)))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(agent.generate_agent_specification(dict(input_data)))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "AGENT_NAME: Shared"
+        assert first.cancelled()
+        mock_model.generate_content_async.assert_called_once()
+        assert agent._inflight == {}
@@ -0,0 +1,468 @@
+"""
+Tests for the Code Review Agent
+"""
+
+import ast
+import functools
+import os
+import sqlite3
+import pytest
+
+from src.agents.base import AgentContext
+from src.agents.code_reviewer import (
+    CodeReviewAgent, ComplexityAnalyzer, ReviewCache, SeverityLevel, IssueCategory
+)
+from src.config import Config
+
+
+class TestCommonIssues:
+    """Test cases for checks shared by every language"""
+    
+    @pytest.fixture
+    def agent(self):
+        """Create a test code review agent"""
+        return CodeReviewAgent(Config())
+    
+    def check(self, agent, content):
+        return list(agent._check_common_issues("test.py", content, content.splitlines()))
+    
+    def test_sensitive_data_detected(self, agent):
+        """Test each kind of hard-coded credential is reported"""
+        issues = self.check(agent, "\n".join([
+            'api_key = "abc-123"',
+            'PASSWORD = "hunter2"',
+            'token = "t.o-k"',
+            'private_key = "-----BEGIN"',
+        ]))
+        
+        messages = [i.message for i in issues if i.category == IssueCategory.SECURITY]
+        assert messages == [
+            "API key exposed",
+            "Password/secret exposed",
+            "Token exposed",
+            "Private key exposed",
+        ]
+        assert all(i.severity == SeverityLevel.CRITICAL for i in issues)
+    
+    def test_multiple_secrets_on_one_line(self, agent):
+        """Test a line leaking several kinds of secret reports each once"""
+        issues = self.check(agent, 'password = "a"; token = "b"; pwd = "c"')
+        
+        assert [(i.line, i.message) for i in issues] == [
+            (1, "Password/secret exposed"),
+            (1, "Token exposed"),
+        ]
+    
+    def test_overlapping_secrets_on_one_line(self, agent):
+        """Test a secret whose value contains another kind of secret reports both"""
+        issues = self.check(agent, 'password = "token = \'x\'"')
+        
+        assert [i.message for i in issues] == ["Password/secret exposed", "Token exposed"]
+    
+    def test_style_and_todo_checks(self, agent):
+        """Test TODO, line length and trailing whitespace checks"""
+        issues = self.check(agent, "x = 1  # todo: fix \n\n" + "y" * 121)
+        
+        assert [(i.line, i.message) for i in issues] == [
+            (1, "Unresolved TODO/FIXME comment"),
+            (1, "Trailing whitespace"),
+            (3, "Line too long (121 > 120 characters)"),
+        ]
+    
+    def test_clean_code_has_no_issues(self, agent):
+        """Test clean lines produce no issues"""
+        assert self.check(agent, "def f():\n    return os.environ['TOKEN']\n") == []
+
+
+
+SAMPLE_FUNCTION = """
+def sample(items, flag):
+    total = 0
+    for item in items:
+        if item and flag:
+            try:
+                total += item
+            except ValueError:
+                pass
+    return total
+"""
+
+
+class TestComplexityAnalyzer:
+    """Test cases for ComplexityAnalyzer"""
+    
+    @pytest.fixture
+    def function(self):
+        """Parse the sample function"""
+        return ast.parse(SAMPLE_FUNCTION).body[0]
+    
+    def test_metrics(self, function):
+        """Test complexity metrics for a known function"""
+        assert ComplexityAnalyzer.calculate_cyclomatic_complexity(function) == 5
+        assert ComplexityAnalyzer.calculate_cognitive_complexity(function) == 7
+        assert ComplexityAnalyzer.calculate_nesting_depth(function) == 3
+        
+        halstead = ComplexityAnalyzer.calculate_halstead_metrics(function)
+        assert halstead['volume'] > 0
+        assert halstead['effort'] == pytest.approx(halstead['volume'] * halstead['difficulty'])
+    
+    def test_deep_tree_does_not_recurse(self):
+        """Test nesting deeper than the recursion limit is measured"""
+        node = ast.Pass()
+        for _ in range(5000):
+            node = ast.If(test=ast.Name(id='x'), body=[node], orelse=[])
+        
+        assert ComplexityAnalyzer.calculate_nesting_depth(node) == 4999
+        assert ComplexityAnalyzer.calculate_cognitive_complexity(node) == sum(range(1, 5001))
+    
+    def test_file_metrics_match_per_node_metrics(self, function):
+        """Test the single-pass file metrics agree with the per-node calculations"""
+        metrics = CodeReviewAgent(Config()).calculate_metrics(SAMPLE_FUNCTION, SAMPLE_FUNCTION.splitlines())
+        
+        assert metrics.functions == 1
+        assert metrics.cyclomatic_complexity == ComplexityAnalyzer.calculate_cyclomatic_complexity(function)
+        assert metrics.cognitive_complexity == ComplexityAnalyzer.calculate_cognitive_complexity(function)
+        assert metrics.max_nesting_depth == ComplexityAnalyzer.calculate_nesting_depth(ast.parse(SAMPLE_FUNCTION))
+    
+    def test_deep_expression_does_not_recurse(self):
+        """Test expressions nested past the recursion limit are measured"""
+        content = "def f(a):\n    return " + " + ".join(["a"] * 2000) + "\n"
+        
+        metrics = CodeReviewAgent(Config()).calculate_metrics(content, content.splitlines())
+        
+        assert metrics.functions == 1
+        assert metrics.cyclomatic_complexity == 1
+    
+    def test_metrics_cached_on_node(self, function):
+        """Test repeated calls on the same node reuse the cached result"""
+        first = ComplexityAnalyzer.calculate_cyclomatic_complexity(function)
+        function.body = []  # A fresh computation would now differ
+        
+        assert ComplexityAnalyzer.calculate_cyclomatic_complexity(function) == first
+    
+    def test_depth_passed_by_keyword(self, function):
+        """Test depth arguments work by keyword and bypass the cache when nonzero"""
+        assert ComplexityAnalyzer.calculate_cognitive_complexity(function, depth=0) == \
+            ComplexityAnalyzer.calculate_cognitive_complexity(function)
+        assert ComplexityAnalyzer.calculate_cognitive_complexity(function, depth=1) == \
+            ComplexityAnalyzer.calculate_cognitive_complexity(function, 1)
+        assert ComplexityAnalyzer.calculate_nesting_depth(function, current_depth=1) == \
+            ComplexityAnalyzer.calculate_nesting_depth(function) + 1
+
+
+class TestJavaScriptAnalysis:
+    """Test cases for JavaScript heuristics"""
+    
+    def test_block_end_skips_strings_and_comments(self):
+        """Test braces in strings, templates and comments are not counted"""
+        content = 'function f() {\n  const s = "}";\n  // }\n  return `${s}}`;\n}\nafter()'
+        
+        end = CodeReviewAgent._find_javascript_block_end(content, 0)
+        
+        assert content[end:] == '}\nafter()'
+    
+    def test_typescript_adds_its_checks_after_javascript(self):
+        """Test TypeScript files get both JavaScript and TypeScript issues"""
+        agent = CodeReviewAgent(Config())
+        lines = ['let x: any = 1;', 'if (x == 2) {}']
+        
+        issues = agent._analyze_typescript("test.ts", "\n".join(lines), lines)
+        
+        assert [(i.line, i.message, i.category) for i in issues] == [
+            (2, "Use === for strict equality", IssueCategory.RELIABILITY),
+            (1, "Avoid using 'any' type", IssueCategory.MAINTAINABILITY),
+        ]
+    
+    def test_line_patterns_do_not_cross_lines(self):
+        """Test each line is judged on its own, as if scanned alone"""
+        agent = CodeReviewAgent(Config())
+        lines = ['let x: any', ']', 'var', 'y']
+        
+        issues = agent._analyze_typescript("test.ts", "\n".join(lines), lines)
+        
+        assert [(i.line, i.message) for i in issues] == [(1, "Avoid using 'any' type")]
+    
+    @pytest.mark.parametrize("header, name", [
+        ("function f(o = {}) {", "f"),
+        ("function Comp({ a, b }) {", "Comp"),
+        ("const g = function ({ a }, o = { b: {} }) {", "g"),
+    ])
+    def test_braces_in_parameters_are_not_the_body(self, header, name):
+        """Test default and destructured parameters do not end the function before its body"""
+        agent = CodeReviewAgent(Config())
+        content = "\n".join([header] + ["  if (a && b) x();"] * 60 + ["}"])
+        
+        issues = list(agent._analyze_javascript_complexity("test.js", content))
+        
+        assert [i.message for i in issues] == [
+            f"High complexity (121) in function '{name}'",
+            f"Function '{name}' is too long (61 lines)",
+        ]
+    
+    def test_functions_in_comments_and_strings_are_skipped(self):
+        """Test function mentions inside comments and strings are not analyzed"""
+        agent = CodeReviewAgent(Config())
+        body = ["  if (a && b) x();"] * 60
+        content = "\n".join(["// function old() {", "const s = 'function quoted() {';", "/*", "function block() {"]
+                             + body + ["}", "*/"])
+        
+        assert list(agent._analyze_javascript_complexity("test.js", content)) == []
+    
+    def test_unclosed_block(self):
+        """Test an unclosed block has no end"""
+        assert CodeReviewAgent._find_javascript_block_end('function f() {', 0) is None
+
+
+class TestReviewFile:
+    """Test cases for reviewing a single file"""
+    
+    def test_source_reused_until_file_changes(self, tmp_path):
+        """Test file content is read again only after the file changes"""
+        agent = CodeReviewAgent(Config())
+        path = tmp_path / "module.py"
+        path.write_text("x = 1\n")
+        
+        content, lines = agent._read_source(str(path))
+        assert agent._read_source(str(path))[1] is lines
+        
+        path.write_text("x = 1\ny = 2\n")
+        assert agent._read_source(str(path)) == ("x = 1\ny = 2\n", ["x = 1", "y = 2"])
+    
+    @pytest.mark.asyncio
+    async def test_large_file_gets_line_checks_only(self, tmp_path, monkeypatch):
+        """Test files over the size limit skip language analysis"""
+        monkeypatch.setattr("src.agents.code_reviewer._LARGE_FILE_SIZE", 10)
+        path = tmp_path / "bundle.py"
+        path.write_text('def f(a=[]):\n    return eval(a)  # TODO\n')
+        
+        issues = await CodeReviewAgent(Config()).review_file(str(path))
+        
+        assert [(i.line, i.message) for i in issues] == [(2, "Unresolved TODO/FIXME comment")]
+    
+    @pytest.mark.asyncio
+    async def test_large_file_gets_language_line_patterns(self, tmp_path, monkeypatch):
+        """Test files over the size limit still get their language's line patterns, across blocks"""
+        monkeypatch.setattr("src.agents.code_reviewer._LARGE_FILE_SIZE", 10)
+        monkeypatch.setattr("src.agents.code_reviewer._STREAM_BLOCK_LINES", 2)
+        path = tmp_path / "vendor.c"
+        path.write_text('int main() {\n    char b[4];\n    strcpy(b, s);\n    return 0;\n}\n')
+        
+        issues = await CodeReviewAgent(Config()).review_file(str(path))
+        
+        assert [(i.line, i.message) for i in issues] == [(3, "Consider using strncpy() instead of strcpy()")]
+    
+    @pytest.mark.asyncio
+    async def test_large_file_measured_without_reading_it_whole(self, tmp_path, monkeypatch):
+        """Test files over the size limit are measured from the stream"""
+        monkeypatch.setattr("src.agents.code_reviewer._LARGE_FILE_SIZE", 10)
+        agent = CodeReviewAgent(Config())
+        monkeypatch.setattr(agent, "_read_source", None)
+        path = tmp_path / "bundle.js"
+        path.write_text('// bundle\n\nif (a) { b(); }\n')
+        
+        issues, metrics = await agent._review_and_measure(str(path))
+        
+        assert (metrics.lines_of_code, metrics.comment_lines, metrics.blank_lines) == (3, 1, 1)
+        assert metrics.cyclomatic_complexity == 1
+    
+    @pytest.mark.asyncio
+    async def test_large_file_task_measured_from_the_stream(self, tmp_path, monkeypatch):
+        """Test a review_file task on a large file does not read it whole for its metrics"""
+        monkeypatch.setattr("src.agents.code_reviewer._LARGE_FILE_SIZE", 10)
+        agent = CodeReviewAgent(Config())
+        monkeypatch.setattr(agent, "_read_source", None)
+        path = tmp_path / "bundle.js"
+        path.write_text('// bundle\n\nif (a) { b(); }\n')
+        context = AgentContext(session_id="s", user_id="u")
+        
+        result = await agent.execute(str(path), context)
+        
+        assert result["status"] == "success"
+        assert result["metrics"]["lines_of_code"] == 3
+        assert (await agent.execute(str(tmp_path / "missing.js"), context))["status"] == "error"
+
+
+class TestReviewFiles:
+    """Test cases for reviewing several files at once"""
+    
+    @pytest.mark.asyncio
+    async def test_parallel_review_matches_sequential(self, tmp_path):
+        """Test files reviewed in worker processes give the same issues"""
+        agent = CodeReviewAgent(Config())
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"module_{i}.py"
+            path.write_text(f'password = "secret{i}"\ndef f(a=[]):\n    return eval(a)\n')
+            paths.append(str(path))
+        
+        results = await agent.review_files(paths, max_workers=2)
+        
+        assert list(results) == paths
+        for path in paths:
+            assert results[path] == await agent.review_file(path)
+            assert len(results[path]) > 0
+    
+    @pytest.mark.asyncio
+    async def test_worker_pool_reused_and_sized_to_files(self, tmp_path):
+        """Test one pool serves every call, starting no more workers than files, until cleanup"""
+        agent = CodeReviewAgent(Config())
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"module_{i}.py"
+            path.write_text('x = 1\n')
+            paths.append(str(path))
+        
+        try:
+            await agent.review_files(paths)
+            executor = agent._executor
+            await agent.review_files(paths)
+            
+            assert agent._executor is executor
+            assert len(executor._processes) <= 2
+        finally:
+            agent.cleanup()
+        assert agent._executor is None
+    
+    @pytest.mark.asyncio
+    async def test_review_project_aggregates_worker_results(self, tmp_path):
+        """Test a project review combines every file reviewed in parallel"""
+        agent = CodeReviewAgent(Config())
+        for i in range(3):
+            (tmp_path / f"module_{i}.py").write_text('password = "secret"\n\ndef f():\n    return 1\n')
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text('debugger;\n')
+        
+        result = await agent.review_project(str(tmp_path), use_cache=False)
+        
+        assert result.files_reviewed == 3
+        assert result.metrics.functions == 3
+        assert result.metrics.lines_of_code == 12
+        assert len([i for i in result.issues if i.severity == SeverityLevel.CRITICAL]) == 3
+    
+    @pytest.mark.asyncio
+    async def test_review_project_skips_only_whole_directory_names(self, tmp_path):
+        """Test skipped directories match whole path components below the project"""
+        project = tmp_path / "build"  # The project's own location is never skipped
+        for relative in ["build-tools/gen.py", "distribution.py", "dist/bundle.py", "src/.git/hook.py"]:
+            (project / relative).parent.mkdir(parents=True, exist_ok=True)
+            (project / relative).write_text('x = 1\n')
+        
+        result = await CodeReviewAgent(Config()).review_project(str(project), use_cache=False)
+        
+        assert result.files_reviewed == 2
+    
+    @pytest.mark.asyncio
+    async def test_review_project_averages_maintainability(self, tmp_path):
+        """Test the project maintainability index is the mean over its files"""
+        agent = CodeReviewAgent(Config())
+        sources = ['x = 1\n', 'def f(a):\n    if a:\n        return 1\n    return 2\n']
+        for i, source in enumerate(sources):
+            (tmp_path / f"module_{i}.py").write_text(source)
+        
+        result = await agent.review_project(str(tmp_path), use_cache=False)
+        
+        expected = [agent.calculate_metrics(source, source.splitlines()).maintainability_index
+                    for source in sources]
+        assert result.metrics.maintainability_index == pytest.approx(sum(expected) / 2)
+        assert result.metrics.maintainability_index > 0
+
+
+class TestReviewCache:
+    """Test cases for the persistent review cache"""
+    
+    @pytest.fixture(autouse=True)
+    def cache_home(self, tmp_path_factory, monkeypatch):
+        """Keep review caches in a temporary cache directory"""
+        cache_home = tmp_path_factory.mktemp("cache")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+        return cache_home
+    
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a one-file project"""
+        (tmp_path / "module.py").write_text('password = "secret"\n\ndef f(a=[]):\n    return a\n')
+        return tmp_path
+    
+    @pytest.mark.asyncio
+    async def test_cache_kept_outside_the_project(self, project, cache_home):
+        """Test reviewing a project leaves its tree untouched"""
+        await CodeReviewAgent(Config()).review_project(str(project))
+        
+        assert [p.name for p in project.iterdir()] == ["module.py"]
+        assert len(list((cache_home / "devex" / "reviews").iterdir())) == 1
+    
+    @pytest.mark.asyncio
+    async def test_locked_cache_falls_back_to_reviewing(self, project, cache_home, monkeypatch):
+        """Test a cache another review holds locked only costs fresh reviews"""
+        (project / "other.py").write_text('x = 1\n')
+        await CodeReviewAgent(Config()).review_project(str(project))
+        
+        monkeypatch.setattr(sqlite3, "connect", functools.partial(sqlite3.connect, timeout=0))
+        (database,) = (cache_home / "devex" / "reviews").iterdir()
+        other_review = sqlite3.connect(database, isolation_level=None)
+        other_review.execute("BEGIN IMMEDIATE")
+        try:
+            # A touched file updates its entry, a changed one replaces it
+            os.utime(project / "other.py", ns=(0, 0))
+            (project / "module.py").write_text('token = "t"\n')
+            result = await CodeReviewAgent(Config()).review_project(str(project))
+        finally:
+            other_review.close()
+        
+        assert [i.message for i in result.issues] == ["Token exposed"]
+    
+    @pytest.mark.asyncio
+    async def test_cache_closed_when_review_fails(self, project, monkeypatch):
+        """Test the cache connection is closed even if reviewing a file raises"""
+        closed = []
+        close = ReviewCache.close
+        monkeypatch.setattr(ReviewCache, "close", lambda self: closed.append(close(self)))
+        
+        agent = CodeReviewAgent(Config())
+        async def fail(file_path):
+            raise RuntimeError("review failed")
+        monkeypatch.setattr(agent, "_review_and_measure", fail)
+        
+        with pytest.raises(RuntimeError):
+            await agent.review_project(str(project))
+        assert closed == [None]
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_not_reviewed_again(self, project, monkeypatch):
+        """Test a second review of an unchanged project is served from the cache"""
+        first = await CodeReviewAgent(Config()).review_project(str(project))
+        
+        agent = CodeReviewAgent(Config())
+        async def fail(file_path):
+            raise AssertionError(f"{file_path} reviewed again")
+        monkeypatch.setattr(agent, "_review_and_measure", fail)
+        
+        # Touching a file without changing it still hits
+        os.utime(project / "module.py", ns=(0, 0))
+        second = await agent.review_project(str(project))
+        
+        assert second.issues == first.issues
+        assert second.metrics == first.metrics
+        assert second.score == first.score
+    
+    @pytest.mark.asyncio
+    async def test_changed_files_are_reviewed_again(self, project):
+        """Test a modified file is reviewed again"""
+        agent = CodeReviewAgent(Config())
+        await agent.review_project(str(project))
+        
+        (project / "module.py").write_text('x = 1\n')
+        result = await agent.review_project(str(project))
+        
+        assert result.issues == []
+        assert result.metrics.lines_of_code == 1
+    
+    @pytest.mark.asyncio
+    async def test_binary_files_are_skipped(self, project):
+        """Test files with a NUL byte near the start are not reviewed or measured"""
+        (project / "blob.c").write_bytes(b'\x7fELF\0\0strcpy(a, b);\n')
+        
+        result = await CodeReviewAgent(Config()).review_project(str(project), use_cache=False)
+        
+        assert result.files_reviewed == 1
+        assert all(issue.file.endswith("module.py") for issue in result.issues)
@@ -0,0 +1,288 @@
+"""
+Tests for the inter-agent communication protocol
+"""
+
+import asyncio
+import pytest
+from datetime import timedelta
+
+from src.agents.communication import (
+    MessageBus, AgentProtocol, CollaborationCoordinator, Message, MessageType
+)
+
+
+class TestMessage:
+    """Test cases for Message"""
+    
+    def test_ids_are_unique(self):
+        """Test every new message, including deserialized ones without an id, gets its own id"""
+        ids = {Message().id for _ in range(1000)}
+        ids.add(Message.from_dict({}).id)
+        
+        assert len(ids) == 1001
+    
+    def test_round_trip(self):
+        """Test a message survives conversion to and from a dictionary"""
+        data = Message(sender="a", recipient="b", type=MessageType.QUERY, payload={"n": 1}, ttl=5).to_dict()
+        message = Message.from_dict(data)
+        
+        assert message.to_dict() == data
+        assert message.sender == "a" and message.type == MessageType.QUERY
+    
+    def test_timestamp_is_utc(self):
+        """Test timestamps serialize as naive UTC and parse back to the same instant"""
+        message = Message(timestamp=0.5)
+        
+        assert message.to_dict()["timestamp"] == "1970-01-01T00:00:00.500000"
+        assert Message.from_dict({"timestamp": "1970-01-01T01:00:00+01:00"}).timestamp == 0.0
+
+
+class TestMessageBus:
+    """Test cases for MessageBus"""
+    
+    @pytest.fixture
+    def bus(self):
+        """Create a test message bus"""
+        return MessageBus()
+    
+    @pytest.mark.asyncio
+    async def test_direct_message_delivered(self, bus):
+        """Test a direct message reaches only its recipient"""
+        for agent_id in ["a", "b", "c"]:
+            bus.register_agent(agent_id)
+        await bus.start()
+        
+        await bus.send_message(Message(sender="a", recipient="b", payload={"n": 1}))
+        await bus.stop()
+        
+        assert [m.payload for m in await bus.get_messages("b")] == [{"n": 1}]
+        assert await bus.get_messages("c") == []
+    
+    @pytest.mark.asyncio
+    async def test_direct_message_skips_the_queue(self, bus):
+        """Test a direct message is delivered before send_message returns"""
+        bus.register_agent("b")
+        
+        await bus.send_message(Message(sender="a", recipient="b"))
+        
+        assert bus.message_queue.empty()
+        assert len(await bus.get_messages("b")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_stop_routes_queued_messages(self, bus):
+        """Test stopping the bus delivers the broadcasts already sent"""
+        for agent_id in ["a", "b"]:
+            bus.register_agent(agent_id)
+        await bus.start()
+        
+        for n in range(3):
+            await bus.send_message(Message(sender="a", type=MessageType.BROADCAST, payload={"n": n}))
+        await bus.stop()
+        
+        assert [m.payload["n"] for m in await bus.get_messages("b")] == [0, 1, 2]
+        assert await bus.get_messages("a") == []
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_on_stopped_bus_dropped(self):
+        """Test broadcasting while the bus is not running returns instead of filling the queue"""
+        bus = MessageBus(max_queue_size=1)
+        bus.register_agent("b")
+        
+        for n in range(3):
+            sent = bus.broadcast(Message(sender="a", payload={"n": n}, requires_response=True))
+            assert await asyncio.wait_for(sent, timeout=1) is None
+        await bus.start()
+        await bus.stop()
+        
+        assert bus.message_queue.empty()
+        assert bus.pending_responses == {}
+        assert await bus.get_messages("b") == []
+    
+    @pytest.mark.asyncio
+    async def test_full_channel_does_not_block_broadcast(self, bus):
+        """Test a broadcast reaches every agent while one agent's channel is full"""
+        for agent_id in ["a", "full", "b"]:
+            bus.register_agent(agent_id)
+        for _ in range(bus.agent_channels["full"].maxsize):
+            bus.agent_channels["full"].put_nowait(Message(sender="x"))
+        await bus.start()
+        
+        await bus.broadcast(Message(sender="a", payload={"n": 1}))
+        await asyncio.sleep(0.01)
+        
+        assert [m.payload for m in await bus.get_messages("b")] == [{"n": 1}]
+        
+        # Making room lets the pending delivery complete
+        received = await bus.get_messages("full")
+        await bus.stop()
+        received += await bus.get_messages("full")
+        assert received[-1].payload == {"n": 1}
+    
+    @pytest.mark.asyncio
+    async def test_get_messages_waits_for_first_message(self, bus):
+        """Test a timeout waits for a message that has not arrived yet"""
+        bus.register_agent("b")
+        
+        assert await bus.get_messages("b", timeout=0.01) == []
+        
+        waiting = asyncio.create_task(bus.get_messages("b", timeout=1))
+        await asyncio.sleep(0)
+        await bus.send_message(Message(sender="a", recipient="b", payload={"n": 1}))
+        
+        assert [m.payload for m in await waiting] == [{"n": 1}]
+    
+    @pytest.mark.asyncio
+    async def test_plain_callbacks_called_during_delivery(self, bus):
+        """Test a plain function callback runs before send_message returns"""
+        received = []
+        bus.register_agent("b", received.append)
+        
+        await bus.send_message(Message(sender="a", recipient="b", payload={"n": 1}))
+        
+        assert [m.payload for m in received] == [{"n": 1}]
+    
+    @pytest.mark.asyncio
+    async def test_request_response(self, bus):
+        """Test a query is answered by the recipient's handler"""
+        client = AgentProtocol("client", bus)
+        server = AgentProtocol("server", bus)
+        
+        async def handle_query(message):
+            return {"answer": message.payload["question"] * 2}
+        server.register_handler(MessageType.QUERY, handle_query)
+        await bus.start()
+        
+        assert await client.query("server", {"question": 21}) == {"answer": 42}
+        await bus.stop()
+    
+    @pytest.mark.asyncio
+    async def test_batch_handler_gets_messages_together(self, bus):
+        """Test messages arriving within the window reach a batch handler in one call"""
+        sender = AgentProtocol("sender", bus)
+        receiver = AgentProtocol("receiver", bus)
+        
+        batches = []
+        async def handle_events(messages):
+            batches.append([m.payload["n"] for m in messages])
+        receiver.register_handler(MessageType.EVENT, handle_events, batch=True, window_ms=20)
+        
+        for n in range(3):
+            await sender.send("receiver", MessageType.EVENT, {"n": n})
+        await asyncio.sleep(0.05)
+        await sender.send("receiver", MessageType.EVENT, {"n": 3})
+        await asyncio.sleep(0.05)
+        
+        assert batches == [[0, 1, 2], [3]]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_is_still_handled(self, bus):
+        """Test cancelling the task collecting a batch dispatches it and opens a new one for later messages"""
+        receiver = AgentProtocol("receiver", bus)
+        
+        batches = []
+        async def handle_events(messages):
+            batches.append([m.payload["n"] for m in messages])
+        receiver.register_handler(MessageType.EVENT, handle_events, batch=True, window_ms=20)
+        
+        collecting = asyncio.create_task(
+            receiver._handle_message(Message(sender="s", type=MessageType.EVENT, payload={"n": 0}))
+        )
+        await asyncio.sleep(0)
+        collecting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await collecting
+        await receiver._handle_message(Message(sender="s", type=MessageType.EVENT, payload={"n": 1}))
+        
+        assert batches == [[0], [1]]
+    
+    @pytest.mark.asyncio
+    async def test_batched_requests_are_answered(self, bus):
+        """Test each message of a batch that requires a response gets one"""
+        client = AgentProtocol("client", bus)
+        server = AgentProtocol("server", bus)
+        
+        async def handle_queries(messages):
+            pass
+        server.register_handler(MessageType.QUERY, handle_queries, batch=True)
+        
+        answers = await asyncio.gather(*(client.query("server", {"n": n}) for n in range(2)))
+        
+        assert answers == [{"status": "ok"}, {"status": "ok"}]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_request_is_forgotten(self, bus):
+        """Test a sender cancelled while awaiting a response leaves nothing pending"""
+        bus.register_agent("b")
+        
+        request = asyncio.create_task(
+            bus.send_message(Message(sender="a", recipient="b", requires_response=True))
+        )
+        await asyncio.sleep(0)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        
+        assert bus.pending_responses == {}
+        bus.send_response((await bus.get_messages("b"))[0].id, Message(sender="b"))
+    
+    @pytest.mark.asyncio
+    async def test_expired_messages_are_dropped(self, bus):
+        """Test messages past their time to live are neither sent nor received"""
+        bus.register_agent("b")
+        
+        await bus.send_message(Message(sender="a", recipient="b", timestamp=0.0, ttl=1))
+        await bus.send_message(Message(sender="a", recipient="b", ttl=60, payload={"n": 1}))
+        await bus.send_message(Message(sender="a", recipient="b", ttl=0.01, payload={"n": 2}))
+        await asyncio.sleep(0.02)
+        
+        assert [m.payload for m in await bus.get_messages("b")] == [{"n": 1}]
+    
+    @pytest.mark.asyncio
+    async def test_expired_request_answers_none(self, bus):
+        """Test a request that expires unread stops waiting for its response"""
+        bus.register_agent("b")
+        
+        request = asyncio.create_task(
+            bus.send_message(Message(sender="a", recipient="b", ttl=0.01, requires_response=True))
+        )
+        await asyncio.sleep(0.02)
+        
+        assert await bus.get_messages("b") == []
+        assert await asyncio.wait_for(request, timeout=1) is None
+
+
+class TestCollaborationCoordinator:
+    """Test cases for CollaborationCoordinator"""
+    
+    @pytest.fixture
+    def coordinator(self):
+        """Create a test coordinator with a one minute time to live"""
+        return CollaborationCoordinator(MessageBus(), collaboration_ttl=60)
+    
+    @pytest.mark.asyncio
+    async def test_unended_collaborations_expire(self, coordinator):
+        """Test collaborations never ended are forgotten after their time to live"""
+        for collaboration_id in ["old", "recent"]:
+            await coordinator.initiate_collaboration(collaboration_id, [], "objective", {})
+        coordinator.active_collaborations["old"]["started_at"] -= timedelta(minutes=2)
+        
+        assert [c["id"] for c in coordinator.get_active_collaborations()] == ["recent"]
+        assert "old" not in coordinator.active_collaborations
+    
+    @pytest.mark.asyncio
+    async def test_restarted_collaboration_does_not_shield_expired_ones(self, coordinator):
+        """Test restarting a collaboration moves it behind those started since"""
+        for collaboration_id in ["a", "b", "a"]:
+            await coordinator.initiate_collaboration(collaboration_id, [], "objective", {})
+        coordinator.active_collaborations["b"]["started_at"] -= timedelta(minutes=2)
+        
+        assert [c["id"] for c in coordinator.get_active_collaborations()] == ["a"]
+    
+    @pytest.mark.asyncio
+    async def test_active_collaborations_are_copies(self, coordinator):
+        """Test changing a returned collaboration leaves the coordinator's record alone"""
+        await coordinator.initiate_collaboration("c", [], "objective", {})
+        
+        coordinator.get_active_collaborations()[0]["status"] = "completed"
+        
+        assert [c["id"] for c in coordinator.get_active_collaborations()] == ["c"]
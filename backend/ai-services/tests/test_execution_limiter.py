@@ -4,6 +4,7 @@ Tests for the execution limiter module
 
 import asyncio
 import pytest
+import sys
 import time
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
@@ -38,7 +39,7 @@ class TestExecutionLimiter:
         
         assert result == "success"
         assert len(limiter.execution_history) == 1
-        assert limiter.execution_history[0]["success"] is True
+        assert limiter.execution_history[0].success is True
     
     @pytest.mark.asyncio
     async def test_timeout_execution(self, limiter):
@@ -55,7 +56,7 @@ class TestExecutionLimiter:
         
         assert "Execution exceeded 1.0s limit" in str(exc_info.value)
         assert len(limiter.execution_history) == 1
-        assert limiter.execution_history[0]["success"] is False
+        assert limiter.execution_history[0].success is False
     
     @pytest.mark.asyncio
     async def test_concurrent_execution_limit(self, limiter):
@@ -102,8 +103,8 @@ class TestExecutionLimiter:
         
         assert str(exc_info.value) == "Test error"
         assert len(limiter.execution_history) == 1
-        assert limiter.execution_history[0]["success"] is False
-        assert limiter.execution_history[0]["error"] == "Test error"
+        assert limiter.execution_history[0].success is False
+        assert limiter.execution_history[0].error == "Test error"
     
     @pytest.mark.asyncio
     async def test_memory_tracking(self, limiter):
@@ -124,7 +125,16 @@ class TestExecutionLimiter:
             
             assert result == 1000000
             history = limiter.execution_history[0]
-            assert history["memory_used"] == 30.0  # 80 - 50
+            assert history.memory_used == 30.0  # 80 - 50
+    
+    def test_memory_usage_without_proc_or_resource(self, limiter, monkeypatch):
+        """Test memory usage reads as zero where neither /proc nor the resource module exists"""
+        def no_proc(*args, **kwargs):
+            raise OSError("no /proc")
+        monkeypatch.setattr("builtins.open", no_proc)
+        monkeypatch.setitem(sys.modules, "resource", None)
+        
+        assert limiter._get_memory_usage() == 0.0
     
     @pytest.mark.asyncio
     async def test_history_size_limit(self, limiter):
@@ -144,7 +154,7 @@ class TestExecutionLimiter:
         assert len(limiter.execution_history) == 10
         
         # Should contain the most recent executions
-        assert limiter.execution_history[-1]["execution_id"] == "test_14"
+        assert limiter.execution_history[-1].execution_id == "test_14"
     
     def test_get_stats_empty(self, limiter):
         """Test statistics when no executions have occurred"""
@@ -181,20 +191,32 @@ class TestExecutionLimiter:
         assert stats["avg_duration"] > 0
         assert stats["active_executions"] == 0
     
+    def test_get_stats_after_history_eviction(self, limiter):
+        """Test statistics cover only the executions still in history"""
+        for i in range(15):
+            limiter._record_execution(f"test_{i}", success=i >= 10, duration=i, memory_used=1)
+        
+        stats = limiter.get_stats()
+        
+        assert stats["total_executions"] == 10
+        assert stats["success_rate"] == pytest.approx(50)
+        assert stats["avg_duration"] == pytest.approx(sum(range(5, 15)) / 10)
+        assert stats["avg_memory"] == pytest.approx(1)
+    
     @pytest.mark.asyncio
     async def test_periodic_cleanup(self, limiter):
         """Test periodic cleanup mechanism"""
         limiter.cleanup_interval = 0.1  # Short interval for testing
-        limiter.last_cleanup = time.time() - 1  # Force cleanup
+        limiter.last_cleanup = time.monotonic() - 1  # Force cleanup
         
         # Add some active executions
         limiter.active_executions["old"] = {
-            "start_time": time.time() - 7200,  # 2 hours ago
+            "start_time": time.monotonic() - 7200,  # 2 hours ago
             "start_memory": 50,
             "function": "old_func"
         }
         limiter.active_executions["recent"] = {
-            "start_time": time.time() - 10,  # 10 seconds ago
+            "start_time": time.monotonic() - 10,  # 10 seconds ago
             "start_memory": 50,
             "function": "recent_func"
         }
@@ -0,0 +1,137 @@
+"""
+Tests for the Agent Factory
+"""
+
+import pytest
+
+from src.agents.base import AgentType, ConversationalAgent
+from src.agents.factory import AgentFactory
+from src.agents.specifications import AgentSpecification
+from src.config import Config
+
+
+class TestAgentFactory:
+    """Test cases for AgentFactory"""
+    
+    @pytest.fixture
+    def factory(self):
+        """Create a test agent factory"""
+        return AgentFactory(Config())
+    
+    def test_classes_resolved_on_first_use(self, factory):
+        """Test agent classes are only looked up once an agent needs them"""
+        assert factory._class_cache == {}
+        
+        agent_class = factory._determine_agent_class(AgentSpecification(name="Code_Reviewer"))
+        
+        assert agent_class.__name__ == "CodeReviewAgent"
+        assert factory._class_cache == {"code_reviewer": agent_class}
+        assert factory._resolve("unknown") is None
+    
+    def test_earliest_registered_match_wins(self, factory):
+        """Test a name containing several type names gets the first registered one"""
+        for name in ["git_agent code_reviewer", "code_reviewer git_agent"]:
+            agent_class = factory._determine_agent_class(AgentSpecification(name=name))
+            assert agent_class.__name__ == "CodeReviewAgent"
+    
+    def test_template_config_applied(self, factory):
+        """Test a template named in the agent name supplies its configuration"""
+        spec = AgentSpecification(name="Lead_QA_Engineer")
+        
+        assert factory._determine_agent_class(spec).__name__ == "TestingAgent"
+        assert factory._prepare_agent_config(spec)['include_e2e'] is True
+    
+    def test_responsibilities_and_tools_shared(self, factory):
+        """Test equal responsibility and tool strings of different agents are one object"""
+        configs = [
+            factory._prepare_agent_config(AgentSpecification(
+                responsibilities=["".join(["write ", "tests"])], tools=["".join(["py", "test"])]
+            ))
+            for _ in range(2)
+        ]
+        
+        assert configs[0]['responsibilities'] == ("write tests",)
+        assert configs[0]['responsibilities'][0] is configs[1]['responsibilities'][0]
+        assert configs[0]['tools'][0] is configs[1]['tools'][0]
+    
+    def test_template_found_by_its_title(self, factory):
+        """Test a name that is a template name with spaces refers to that template"""
+        spec = AgentSpecification(name="Qa Engineer")
+        
+        assert factory._prepare_agent_config(spec)['include_e2e'] is True
+    
+    def test_explicit_base_class_wins(self, factory):
+        """Test a specification naming its agent type is not dispatched by name"""
+        spec = AgentSpecification(name="code_reviewer", base_class="git_agent")
+        
+        assert factory._determine_agent_class(spec).__name__ == "GitAgent"
+    
+    def test_template_base_class_used(self, factory):
+        """Test an agent created from a template gets the template's base class"""
+        agent = factory.create_agent_from_template("security_analyst", custom_name="Auditor")
+        
+        assert type(agent).__name__ == "CodeReviewAgent"
+    
+    def test_template_config_not_modified(self, factory, monkeypatch):
+        """Test additional configuration does not leak into the template"""
+        spec_configs = []
+        monkeypatch.setattr(factory, "create_agent", lambda spec: spec_configs.append(spec.context_requirements))
+        
+        factory.create_agent_from_template("security_analyst", additional_config={"focus": "style"})
+        
+        assert spec_configs[0]["focus"] == "style"
+        assert factory.agent_configs["security_analyst"]["config"]["focus"] == "security"
+    
+    def test_templates_cannot_be_changed_through_a_factory(self, factory):
+        """Test the shared template values are read-only in every factory and agent config"""
+        with pytest.raises(TypeError):
+            factory.agent_configs["security_analyst"]["config"]["focus"] = "style"
+        with pytest.raises(AttributeError):
+            factory._prepare_agent_config(AgentSpecification(name="qa_engineer"))["test_frameworks"].append("nose")
+        
+        frameworks = AgentFactory(Config()).agent_configs["qa_engineer"]["config"]["test_frameworks"]
+        assert frameworks == ("pytest", "jest", "mocha", "junit")
+    
+    def test_type_fallback(self, factory):
+        """Test a name matching nothing falls back on the agent type"""
+        spec = AgentSpecification(name="helper", type=AgentType.CREATIVE)
+        
+        assert factory._determine_agent_class(spec) is ConversationalAgent
+    
+    def test_registered_type_is_used(self, factory):
+        """Test an agent type registered at runtime is resolved by name"""
+        class CustomAgent(ConversationalAgent):
+            pass
+        factory.register_agent_type("custom", CustomAgent)
+        
+        assert "custom" in factory.get_available_types()
+        assert factory._determine_agent_class(AgentSpecification(name="my custom agent")) is CustomAgent
+    
+    def test_constructor_arguments_worked_out_once(self, factory, monkeypatch):
+        """Test a class's constructor signature is inspected only once"""
+        spec = AgentSpecification(name="git_agent")
+        first = factory.create_agent(spec)
+        monkeypatch.setattr("src.agents.factory.inspect.signature", None)
+        
+        second = factory.create_agent(spec)
+        
+        assert type(second) is type(first)
+        assert second.agent_id == spec.agent_id
+        assert second.custom_config["agent_id"] == spec.agent_id
+    
+    def test_conversational_agent_uses_template_prompt(self, factory):
+        """Test a conversational template's system prompt reaches the agent"""
+        agent = factory.create_agent(AgentSpecification(name="devops_engineer"))
+        
+        assert type(agent) is ConversationalAgent
+        assert agent.system_prompt.startswith("You are a DevOps engineer")
+    
+    def test_unsupported_constructor_rejected_up_front(self, factory):
+        """Test a class needing arguments the factory lacks fails with a clear error"""
+        class NeedyAgent(ConversationalAgent):
+            def __init__(self, name, workspace):
+                super().__init__(name=name, agent_type=AgentType.CODE, system_prompt="")
+        factory.register_agent_type("needy", NeedyAgent)
+        
+        with pytest.raises(ValueError, match="cannot supply: workspace"):
+            factory.create_agent(AgentSpecification(name="needy"))
@@ -0,0 +1,217 @@
+"""
+Tests for the Git Agent
+"""
+
+import asyncio
+import json
+import subprocess
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+from src.agents.base import AgentContext
+from src.agents.git_agent import GitAgent, CommitType
+from src.config import Config
+
+
+def git(repo, *args):
+    """Run a git command synchronously and return its output"""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class TestGitAgent:
+    """Test cases for GitAgent"""
+    
+    @pytest.fixture
+    def agent(self):
+        """Create a test git agent"""
+        return GitAgent(Config())
+    
+    @pytest.fixture(autouse=True)
+    def identity(self, monkeypatch):
+        """Commit as a test user"""
+        for variable in ["GIT_AUTHOR", "GIT_COMMITTER"]:
+            monkeypatch.setenv(f"{variable}_NAME", "Test")
+            monkeypatch.setenv(f"{variable}_EMAIL", "test@example.com")
+    
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Create a repository with one commit"""
+        git(tmp_path, "init", "-q", "-b", "main")
+        (tmp_path / "README.md").write_text("# Test\n")
+        git(tmp_path, "add", ".")
+        git(tmp_path, "commit", "-q", "-m", "Initial commit")
+        return str(tmp_path)
+    
+    @pytest.mark.asyncio
+    async def test_initialize_repository(self, agent, tmp_path):
+        """Test a new repository starts on the requested branch with a committed .gitignore"""
+        path = str(tmp_path / "project")
+        
+        result = await agent.initialize_repository(path, initial_branch="trunk")
+        
+        assert result["status"] == "success"
+        assert git(path, "rev-parse", "--abbrev-ref", "HEAD") == "trunk"
+        assert git(path, "log", "--format=%s") == "Initial commit: Add .gitignore"
+        assert "node_modules/" in git(path, "show", "HEAD:.gitignore").splitlines()
+    
+    @pytest.mark.asyncio
+    async def test_commit_reports_new_hash(self, agent, repo):
+        """Test a commit reports the abbreviated hash of the commit it made"""
+        (Path(repo) / "app.py").write_text("x = 1\n")
+        await agent.add_files(repo)
+        
+        result = await agent.create_commit(repo, "[wip] add app", CommitType.FEAT, scope="app")
+        
+        assert result["status"] == "success"
+        assert result["message"] == "feat(app): [wip] add app"
+        assert result["commit_hash"] == git(repo, "rev-parse", "HEAD")[:7]
+    
+    @pytest.mark.asyncio
+    async def test_commit_with_nothing_staged(self, agent, repo):
+        """Test committing a clean tree is reported rather than failing"""
+        result = await agent.create_commit(repo, "empty")
+        
+        assert result["status"] == "info"
+    
+    @pytest.mark.asyncio
+    async def test_status(self, agent, repo):
+        """Test status sorts changed files and reports the branch"""
+        (Path(repo) / "README.md").write_text("# Changed\n")
+        (Path(repo) / "new file.py").write_text("")
+        (Path(repo) / "staged.py").write_text("")
+        git(repo, "add", "staged.py")
+        
+        status = await agent.get_status(repo)
+        
+        assert status["branch"] == "main"
+        assert status["staged"] == ["staged.py"]
+        assert status["modified"] == ["README.md"]
+        assert status["untracked"] == ["new file.py"]
+        assert status["clean"] is False
+    
+    @pytest.mark.asyncio
+    async def test_status_of_renames_deletions_and_detached_head(self, agent, repo):
+        """Test renamed and deleted files are attributed to the right paths"""
+        git(repo, "mv", "README.md", "GUIDE.md")
+        git(repo, "commit", "-q", "-m", "Rename")
+        git(repo, "checkout", "-q", "--detach")
+        git(repo, "mv", "GUIDE.md", "DOCS.md")
+        (Path(repo) / "DOCS.md").unlink()
+        
+        status = await agent.get_status(repo)
+        
+        assert status["branch"] == "HEAD"
+        assert status["deleted"] == ["DOCS.md"]
+        assert status["untracked"] == []
+    
+    @pytest.mark.asyncio
+    async def test_log_keeps_separators_in_messages(self, agent, repo):
+        """Test log fields are split correctly whatever the commit message contains"""
+        git(repo, "commit", "-q", "--allow-empty", "-m", "fix: a | b")
+        
+        log = await agent.get_log(repo)
+        
+        assert log["count"] == 2
+        assert [c["message"] for c in log["commits"]] == ["fix: a | b", "Initial commit"]
+        assert log["commits"][0]["author"] == "Test"
+        assert log["commits"][0]["hash"] == git(repo, "rev-parse", "--short=7", "HEAD")
+        assert datetime.fromisoformat(log["commits"][0]["date"])
+    
+    def test_commit_message_scope(self, agent):
+        """Test the scope is the top directory shared by every changed file"""
+        def scope_of(files):
+            return agent.generate_commit_message({"files": files, "type": "feature"})
+        
+        assert scope_of(["src/api/a.py", "src/db/b.py"]) == "feat(src): Update files"
+        assert scope_of(["api/x/c.py", "db/x/c.py"]) == "feat: Update files"
+        assert scope_of(["README.md", "setup.py"]) == "feat: Update files"
+    
+    def test_commit_message_type(self, agent):
+        """Test change types map to conventional commit types"""
+        def type_of(change_type):
+            return agent.generate_commit_message({"type": change_type}).split(":")[0]
+        
+        assert [type_of(t) for t in ["bugfix", "performance", "refactor", "update"]] == [
+            "fix", "perf", "refactor", "chore"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_merge_reports_conflicts(self, agent, repo):
+        """Test a conflicting merge lists the conflicted files"""
+        git(repo, "checkout", "-q", "-b", "feature")
+        (Path(repo) / "README.md").write_text("# Feature\n")
+        git(repo, "commit", "-q", "-am", "Feature heading")
+        git(repo, "checkout", "-q", "main")
+        (Path(repo) / "README.md").write_text("# Main\n")
+        git(repo, "commit", "-q", "-am", "Main heading")
+        
+        result = await agent.merge_branch(repo, "feature", strategy="ort")
+        
+        assert result["status"] == "conflict"
+        assert result["conflicts"] == ["README.md"]
+    
+    @pytest.mark.asyncio
+    async def test_execute_dispatches_operations(self, agent, repo):
+        """Test execute runs the requested operation and rejects unknown ones"""
+        context = AgentContext(session_id="s", user_id="u", execution_id="e")
+        
+        result = await agent.execute(json.dumps({"operation": "tag", "path": repo, "name": "v1", "message": "One"}), context)
+        
+        assert result["status"] == "success"
+        assert git(repo, "tag") == "v1"
+        assert context.variables["git_result"] is result
+        assert (await agent.execute(json.dumps({"operation": "rebase"}), context))["status"] == "error"
+    
+    @pytest.mark.asyncio
+    async def test_execute_treats_plain_input_as_path(self, agent, repo):
+        """Test input that is not a JSON object asks for the status of that path"""
+        context = AgentContext(session_id="s", user_id="u", execution_id="e")
+        
+        assert (await agent.execute(repo, context))["branch"] == "main"
+        assert (await agent.execute("{not json", context))["status"] == "error"
+    
+    @pytest.mark.asyncio
+    async def test_writers_to_a_repository_run_one_at_a_time(self, agent, monkeypatch):
+        """Test writes to one repository are serialized while reads overlap"""
+        running = []
+        peaks = []
+        async def run_git_command(command, cwd=".", capture="text"):
+            running.append(cwd)
+            peaks.append(running.count(cwd))
+            await asyncio.sleep(0.01)
+            running.remove(cwd)
+            return True, "", ""
+        monkeypatch.setattr(agent, "_run_git_command", run_git_command)
+        
+        await asyncio.gather(*(agent.checkout_branch(path, "main") for path in ["a", "a", "a", "b"]))
+        assert max(peaks) == 1
+        
+        peaks.clear()
+        await asyncio.gather(*(agent.get_log("a", oneline=True) for _ in range(3)))
+        assert max(peaks) == 3
+    
+    @pytest.mark.asyncio
+    async def test_aliased_paths_share_a_repository_lock(self, agent, tmp_path, monkeypatch):
+        """Test writes through different spellings of one path are serialized"""
+        running = []
+        peaks = []
+        async def run_git_command(command, cwd=".", capture="text"):
+            running.append(cwd)
+            peaks.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(cwd)
+            return True, "", ""
+        monkeypatch.setattr(agent, "_run_git_command", run_git_command)
+        monkeypatch.chdir(tmp_path.parent)
+        
+        aliases = [str(tmp_path), f"{tmp_path}/", tmp_path.name, f"./{tmp_path.name}"]
+        await asyncio.gather(
+            *(agent.checkout_branch(path, "main") for path in aliases),
+            agent.checkout_branch(repo_path=str(tmp_path), branch_name="main"),
+            agent.initialize_repository(path=str(tmp_path))
+        )
+        assert max(peaks) == 1
+        assert len(agent._repo_locks) == 1